@@ -0,0 +1,159 @@
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+CASES: Dict[str, Callable[[], Callable[[], object]]] = {}
+MEMORY_CASES: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def case(name: str):
+    """
+    Registers a benchmark case. The decorated function does the setup and returns the callable to time.
+    """
+    def decorator(setup: Callable[[], Callable[[], object]]):
+        CASES[name] = setup
+        return setup
+
+    return decorator
+
+
+def memory_case(name: str):
+    """
+    Registers a memory case. The decorated function returns a callable building one object, its retained size is reported.
+    """
+    def decorator(setup: Callable[[], Callable[[], object]]):
+        MEMORY_CASES[name] = setup
+        return setup
+
+    return decorator
+
+
+def measure_bytes(factory: Callable[[], object], number: int = 10000) -> float:
+    """
+    Returns the bytes retained per object when `number` objects built by factory are kept alive
+    """
+    factory()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objs = [factory() for _ in range(number)]
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del objs
+    return retained / number
+
+
+def measure_alloc(func: Callable[[], object], number: int = 5) -> float:
+    """
+    Returns the peak bytes allocated while func runs, the lowest of `number` calls
+    """
+    func()
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(number):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            func()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return min(peaks)
+
+
+def measure(func: Callable[[], object], min_time: float = 0.2) -> float:
+    """
+    Returns ops/sec of func, timed in growing batches until a batch takes at least min_time seconds
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return number / elapsed
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+
+def peak_rss() -> int:
+    """
+    Returns the peak resident set size of the process in bytes, 0 where it is not available
+    """
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def _selected(name: str, names: List[str] = None) -> bool:
+    return not names or any(name.startswith(n) for n in names)
+
+
+def run(names: List[str] = None, min_time: float = 0.2, alloc: bool = True) -> Dict[str, dict]:
+    """
+    Runs the selected cases, returns {name: {'ops': ops/sec, 'alloc': peak bytes per op}}
+    """
+    from benchmarks import cases  # noqa: F401, registers the cases
+
+    results = {}
+    for name, setup in CASES.items():
+        if not _selected(name, names):
+            continue
+        func = setup()
+        results[name] = {'ops': measure(func, min_time)}
+        if alloc:
+            results[name]['alloc'] = measure_alloc(func)
+    return results
+
+
+def run_memory(names: List[str] = None) -> Dict[str, float]:
+    from benchmarks import cases  # noqa: F401, registers the cases
+
+    return {
+        name: measure_bytes(setup())
+        for name, setup in MEMORY_CASES.items()
+        if _selected(name, names)
+    }
+
+
+def save(path: str, results: dict):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float = 0.1) -> Dict[str, dict]:
+    """
+    Returns {name: {metric: relative change}} for the cases found in both runs, a positive change is an improvement.
+    Changes worse than `threshold` (0.1 is 10%) are listed under the 'regressions' key of each case.
+    """
+    diffs = {}
+    for name, metrics in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        diff = {'regressions': []}
+        for metric, value in metrics.items():
+            if metric not in old or not old[metric]:
+                continue
+            change = (value - old[metric]) / old[metric]
+            if metric != 'ops':
+                change = -change  # fewer bytes is better
+            diff[metric] = change
+            if change < -threshold:
+                diff['regressions'].append(metric)
+        diffs[name] = diff
+    return diffs
@@ -0,0 +1,37 @@
+import argparse
+import sys
+
+from benchmarks import run, run_memory, peak_rss, save, load, compare
+
+parser = argparse.ArgumentParser(description='pydictable benchmarks')
+parser.add_argument('names', nargs='*', help='Run only the cases starting with these names')
+parser.add_argument('--min-time', type=float, default=0.2, help='Minimum seconds to time each case')
+parser.add_argument('--no-alloc', action='store_true', help='Do not measure allocations with tracemalloc')
+parser.add_argument('--save', metavar='PATH', help='Write the results as JSON, to be used later with --compare')
+parser.add_argument('--compare', metavar='PATH', help='Compare with results saved earlier, exits with 1 on regressions')
+parser.add_argument('--threshold', type=float, default=0.1, help='Relative change counted as a regression')
+args = parser.parse_args()
+
+results = run(args.names, args.min_time, alloc=not args.no_alloc)
+for name, size in run_memory(args.names).items():
+    results[name] = {'bytes': size}
+baseline = load(args.compare)['cases'] if args.compare else {}
+diffs = compare(results, baseline, args.threshold)
+
+UNITS = {'ops': 'ops/sec', 'alloc': 'B peak/op', 'bytes': 'B/instance'}
+for name, metrics in results.items():
+    columns = []
+    for metric, value in metrics.items():
+        column = f'{value:>14,.0f} {UNITS[metric]:<11}'
+        if metric in diffs.get(name, {}):
+            column += f'{diffs[name][metric]:>+8.1%}'
+        columns.append(column)
+    flag = ' REGRESSION' if diffs.get(name, {}).get('regressions') else ''
+    print((f'{name:<40}' + '  '.join(columns)).rstrip() + flag)
+
+rss = peak_rss()
+print(f'{"peak rss":<40}{rss:>14,} B')
+if args.save:
+    save(args.save, {'cases': results, 'peak_rss': rss})
+if any(diff['regressions'] for diff in diffs.values()):
+    sys.exit(1)
@@ -0,0 +1,296 @@
+import asyncio
+import atexit
+import json
+import os
+import tempfile
+
+from benchmarks import case, memory_case
+from benchmarks.models import Person, CompiledPerson, LazyPerson, PERSON, LatLng, CompactLatLng, Garage, GARAGE, \
+    Session, TaggedSession, SESSION, Contacts, UncompiledContacts, CONTACTS, Flat, FLAT, Node, DEEP, Numbers, NUMBERS, \
+    Registry, REGISTRY, PartialPerson, Series, UtcSeries, SERIES, Telemetry, ArrayTelemetry, TELEMETRY, People, PEOPLE_DOC
+from pydictable.json_codec import JSON_BACKENDS
+from pydictable.json_schema import get_json_schema
+from pydictable.snapshot import load_snapshot, write_snapshot
+
+
+@case('decode.flat')
+def decode_flat():
+    return lambda: Flat(dict=FLAT)
+
+
+@case('encode.flat')
+def encode_flat():
+    return Flat(dict=FLAT).to_dict
+
+
+@case('decode.deep')
+def decode_deep():
+    return lambda: Node(dict=DEEP)
+
+
+@case('encode.deep')
+def encode_deep():
+    return Node(dict=DEEP).to_dict
+
+
+@case('decode.list')
+def decode_list():
+    return lambda: Numbers(dict=NUMBERS)
+
+
+@case('encode.list')
+def encode_list():
+    return Numbers(dict=NUMBERS).to_dict
+
+
+@case('decode.dict')
+def decode_dict():
+    return lambda: Registry(dict=REGISTRY)
+
+
+@case('encode.dict')
+def encode_dict():
+    return Registry(dict=REGISTRY).to_dict
+
+
+@case('decode.datetimes')
+def decode_datetimes():
+    return lambda: Series(dict=SERIES)
+
+
+@case('decode.datetimes.utc')
+def decode_datetimes_utc():
+    return lambda: UtcSeries(dict=SERIES)
+
+
+@case('encode.datetimes')
+def encode_datetimes():
+    return Series(dict=SERIES).to_dict
+
+
+@case('decode.telemetry')
+def decode_telemetry():
+    return lambda: Telemetry(dict=TELEMETRY)
+
+
+@case('decode.telemetry.array')
+def decode_telemetry_array():
+    return lambda: ArrayTelemetry(dict=TELEMETRY)
+
+
+@case('encode.telemetry.array')
+def encode_telemetry_array():
+    return ArrayTelemetry(dict=TELEMETRY).to_dict
+
+
+@case('encode.json.people.dumps')
+def encode_json_people_dumps():
+    people = People(dict=PEOPLE_DOC)
+    return lambda: json.dumps(people.to_dict(), separators=(',', ':'), ensure_ascii=False)
+
+
+def _json_backend_cases(name: str):
+    @case(f'encode.json.people.{name}')
+    def encode_json_people():
+        people = People(dict=PEOPLE_DOC)
+        return lambda: people.to_json(backend=name)
+
+    @case(f'encode.json.registry.{name}')
+    def encode_json_registry():
+        registry = Registry(dict=REGISTRY)
+        return lambda: registry.to_json(backend=name)
+
+    @case(f'decode.json.people.{name}')
+    def decode_json_people():
+        text = json.dumps(PEOPLE_DOC).encode()
+        return lambda: People.from_json(text, backend=name)
+
+
+for _name in JSON_BACKENDS:  # every backend installed here
+    _json_backend_cases(_name)
+
+
+@case('decode.json.people.loads')
+def decode_json_people_loads():
+    text = json.dumps(PEOPLE_DOC)
+    return lambda: People(dict=json.loads(text))
+
+
+@case('decode.async.people')
+def decode_async_people():
+    loop = asyncio.new_event_loop()
+    return lambda: loop.run_until_complete(People.afrom_dict(PEOPLE_DOC))
+
+
+@case('decode.partial')
+def decode_partial():
+    return lambda: PartialPerson(dict={'name': 'Pramod'})
+
+
+@case('schema.fields')
+def schema_fields():
+    return Person.get_fields
+
+
+@case('schema.input_spec')
+def schema_input_spec():
+    return Person.get_input_spec
+
+
+@case('schema.json_schema')
+def schema_json_schema():
+    return lambda: get_json_schema(Garage, new_schema=True)
+
+
+@case('decode.person')
+def decode_person():
+    return lambda: Person(dict=PERSON)
+
+
+@case('decode.person.compiled')
+def decode_person_compiled():
+    return lambda: CompiledPerson(dict=PERSON)
+
+
+@case('decode.person.lazy')
+def decode_person_lazy():
+    return lambda: LazyPerson(dict=PERSON)
+
+
+@case('roundtrip.person')
+def roundtrip_person():
+    return lambda: Person(dict=PERSON).to_dict()
+
+
+@case('roundtrip.person.lazy')
+def roundtrip_person_lazy():
+    return lambda: LazyPerson(dict=PERSON).to_dict()
+
+
+@case('validate.person')
+def validate_person():
+    return lambda: Person.validate_dict(PERSON)
+
+
+@case('decode.garage')
+def decode_garage():
+    return lambda: Garage(dict=GARAGE)
+
+
+@case('validate.garage')
+def validate_garage():
+    return lambda: Garage.validate_dict(GARAGE)
+
+
+@case('decode.union')
+def decode_union():
+    return lambda: Session(dict=SESSION)
+
+
+@case('decode.union.discriminator')
+def decode_union_discriminator():
+    return lambda: TaggedSession(dict=SESSION)
+
+
+@case('validate.regex_list')
+def validate_regex_list():
+    return lambda: Contacts.validate_dict(CONTACTS)
+
+
+@case('validate.regex_list.uncompiled')
+def validate_regex_list_uncompiled():
+    return lambda: UncompiledContacts.validate_dict(CONTACTS)
+
+
+@case('encode.person')
+def encode_person():
+    p = Person(dict=PERSON)
+    return p.to_dict
+
+
+@case('encode.person.compiled')
+def encode_person_compiled():
+    p = CompiledPerson(dict=PERSON)
+    return p.to_dict
+
+
+@case('decode.person.trusted')
+def decode_person_trusted():
+    return lambda: Person.from_trusted(PERSON)
+
+
+@case('decode.person.trusted.compiled')
+def decode_person_trusted_compiled():
+    return lambda: CompiledPerson.from_trusted(PERSON)
+
+
+PEOPLE = [PERSON] * 1000
+
+
+@case('batch.person.loop')
+def batch_person_loop():
+    return lambda: [Person(dict=row) for row in PEOPLE]
+
+
+@case('batch.person.from_dicts')
+def batch_person_from_dicts():
+    return lambda: Person.from_dicts(PEOPLE)
+
+
+@case('batch.person.from_dicts.compiled')
+def batch_person_from_dicts_compiled():
+    return lambda: CompiledPerson.from_dicts(PEOPLE)
+
+
+@case('batch.person.validate_many')
+def batch_person_validate_many():
+    rows = PEOPLE * 20
+    return lambda: Person.validate_many(rows)
+
+
+@case('batch.person.to_dicts')
+def batch_person_to_dicts():
+    people = Person.from_dicts(PEOPLE)
+    return lambda: Person.to_dicts(people)
+
+
+@case('batch.person.to_columns')
+def batch_person_to_columns():
+    people = Person.from_dicts(PEOPLE)
+    return lambda: Person.to_columns(people)
+
+
+@case('batch.person.from_columns')
+def batch_person_from_columns():
+    columns = Person.to_columns(Person.from_dicts(PEOPLE))
+    return lambda: Person.from_columns(columns)
+
+
+def _snapshot_path() -> str:
+    fd, path = tempfile.mkstemp(suffix='.snapshot')
+    os.close(fd)
+    atexit.register(os.remove, path)
+    return path
+
+
+@case('batch.person.snapshot.write')
+def batch_person_snapshot_write():
+    people, path = Person.from_dicts(PEOPLE), _snapshot_path()
+    return lambda: write_snapshot(Person, people, path)
+
+
+@case('batch.person.snapshot.load')
+def batch_person_snapshot_load():
+    path = _snapshot_path()
+    write_snapshot(Person, Person.from_dicts(PEOPLE), path)
+    return lambda: [person.name for person in load_snapshot(Person, path)]
+
+
+@memory_case('memory.latlng')
+def memory_latlng():
+    return lambda: LatLng(lat=12345, lng=67890)
+
+
+@memory_case('memory.latlng.compact')
+def memory_latlng_compact():
+    return lambda: CompactLatLng(lat=12345, lng=67890)
@@ -0,0 +1,230 @@
+import re
+from datetime import datetime
+from typing import Dict, List, Union
+
+from pydictable import DictAble, partial
+from pydictable.field import DictValueField, ListField, MultiTypeField, ObjectField, StrField, UnionField, RegexField, \
+    DatetimeField, ArrayField, IntField, FloatField
+
+
+class LatLng(DictAble):
+    lat: int
+    lng: int
+
+
+class Address(DictAble):
+    pin_code: int
+    lat_lng: LatLng
+
+
+class Person(DictAble):
+    name: str
+    address: Address
+
+
+class CompiledLatLng(DictAble, compiled=True):
+    lat: int
+    lng: int
+
+
+class CompiledAddress(DictAble, compiled=True):
+    pin_code: int
+    lat_lng: CompiledLatLng
+
+
+class CompiledPerson(DictAble, compiled=True):
+    name: str
+    address: CompiledAddress
+
+
+PERSON = {
+    'name': 'Pramod',
+    'address': {
+        'pin_code': 560032,
+        'lat_lng': {
+            'lat': 12345,
+            'lng': 67890
+        }
+    }
+}
+
+
+class CompactLatLng(DictAble, compact=True):
+    lat: int
+    lng: int
+
+
+class LazyPerson(DictAble, lazy=True):
+    name: str
+    address: Address
+
+
+class Car(DictAble):
+    name: str
+    seats: int
+
+
+class Bike(DictAble):
+    name: str
+    gears: int
+
+
+class Garage(DictAble):
+    address: Address
+    vehicles: List[DictAble] = ListField(MultiTypeField([Car, Bike]))
+    spots: Dict[str, LatLng] = DictValueField(LatLng)
+
+
+GARAGE = {
+    'address': PERSON['address'],
+    'vehicles': [{'__type': 'Car', 'name': f'car{i}', 'seats': 4} for i in range(10)] +
+                [{'__type': 'Bike', 'name': f'bike{i}', 'gears': 5} for i in range(10)],
+    'spots': {f'spot{i}': {'lat': i, 'lng': i} for i in range(10)}
+}
+
+
+class Click(DictAble):
+    kind: str = StrField(default='click')
+    x: int
+    y: int
+
+
+class Scroll(DictAble):
+    kind: str = StrField(default='scroll')
+    delta: int
+
+
+class KeyPress(DictAble):
+    kind: str = StrField(default='key_press')
+    key: str
+
+
+class Resize(DictAble):
+    kind: str = StrField(default='resize')
+    width: int
+    height: int
+
+
+class Focus(DictAble):
+    kind: str = StrField(default='focus')
+    element: str
+
+
+EVENT_TYPES = [Click, Scroll, KeyPress, Resize, Focus]
+
+
+class Session(DictAble):
+    events: List[Union[Click, Scroll, KeyPress, Resize, Focus]]
+
+
+class TaggedSession(DictAble):
+    events: List[Union[Click, Scroll, KeyPress, Resize, Focus]] = ListField(
+        UnionField([ObjectField(t) for t in EVENT_TYPES], discriminator='kind')
+    )
+
+
+SESSION = {'events': [{'kind': 'focus', 'element': f'input{i}'} for i in range(20)]}
+
+
+EMAIL_REGEX = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+
+
+class UncompiledRegexField(RegexField):
+    """
+    RegexField as it used to validate, going through re's own cache on every value
+    """
+
+    def validate_dict(self, field_name: str, v):
+        assert isinstance(v, str)
+        assert re.match(self.regex_string, v), f"{v} for {field_name} should be in proper format"
+
+
+class Contacts(DictAble):
+    emails: List[str] = ListField(RegexField(EMAIL_REGEX))
+
+
+class UncompiledContacts(DictAble):
+    emails: List[str] = ListField(UncompiledRegexField(EMAIL_REGEX))
+
+
+CONTACTS = {'emails': [f'user{i}@example.com' for i in range(1000)]}
+
+
+class Flat(DictAble):
+    f0: int
+    f1: int
+    f2: int
+    f3: int
+    f4: int
+    f5: str
+    f6: str
+    f7: str
+    f8: float
+    f9: float
+    f10: bool
+    f11: bool
+
+
+FLAT = {**{f'f{i}': i for i in range(5)}, **{f'f{i}': f's{i}' for i in range(5, 8)}, 'f8': 1.5, 'f9': 2.5,
+        'f10': True, 'f11': False}
+
+
+class Node(DictAble):
+    value: int
+    child: 'Node' = None
+
+
+Node.child = ObjectField(Node)
+
+DEEP = {'value': 0}
+for _depth in range(1, 20):
+    DEEP = {'value': _depth, 'child': DEEP}
+
+
+class Numbers(DictAble):
+    values: List[int]
+    points: List[LatLng]
+
+
+NUMBERS = {'values': list(range(10000)), 'points': [{'lat': i, 'lng': i} for i in range(1000)]}
+
+
+class Registry(DictAble):
+    counts: Dict[str, int]
+    places: Dict[str, LatLng]
+
+
+REGISTRY = {'counts': {f'k{i}': i for i in range(10000)}, 'places': {f'k{i}': {'lat': i, 'lng': i} for i in range(1000)}}
+
+PartialPerson = partial(Person)
+
+
+class Series(DictAble):
+    timestamps: List[datetime]
+
+
+class UtcSeries(DictAble):
+    timestamps: List[datetime] = ListField(DatetimeField(utc=True), required=True)
+
+
+SERIES = {'timestamps': [1617129000000 + i for i in range(10000)]}
+
+
+class Telemetry(DictAble):
+    ticks: List[int]
+    samples: List[float]
+
+
+class ArrayTelemetry(DictAble):
+    ticks: List[int] = ArrayField(IntField())
+    samples: List[float] = ArrayField(FloatField())
+
+
+TELEMETRY = {'ticks': list(range(100000)), 'samples': [i / 7 for i in range(100000)]}
+
+
+class People(DictAble):
+    people: List[Person]
+
+
+PEOPLE_DOC = {'people': [PERSON] * 1000}
@@ -0,0 +1,287 @@
+import keyword
+from typing import Dict, Optional, Tuple, Callable
+
+from pydictable.field import StrField, IntField, FloatField, BoolField, ListField, ObjectField, DataValidationError, \
+    _join_path
+from pydictable.type import Field
+
+PRIMITIVE_FIELD_TYPES = {
+    StrField: str,
+    IntField: int,
+    FloatField: float,
+    BoolField: bool
+}
+
+
+def _pre_check_error(attr: str, value, e: AssertionError = None) -> DataValidationError:
+    if e is not None and len(e.args) > 0:
+        return DataValidationError(attr, f'Pre check failed: {str(e)}')
+    return DataValidationError(attr, f'Pre check failed: Invalid value {value} for field {attr}')
+
+
+def _post_check_error(attr: str, value) -> DataValidationError:
+    return DataValidationError(attr, 'Post check failed. Invalid value "{}" for field "{}"'.format(value, attr))
+
+
+# field class -> whether values from its decode() need no post check
+_DECODE_VALIDATES = {}
+
+
+def _decode_validates(field: Field) -> bool:
+    """
+    Whether values from Field.decode can skip the post check: the decode and validate_dict of the built-in fields
+    check what their validate does, a subclass overriding validate (maybe stricter) is still post checked
+    """
+    field_type = type(field)
+    result = _DECODE_VALIDATES.get(field_type)
+    if result is None:
+        owner = next(klass for klass in field_type.__mro__ if 'validate' in klass.__dict__)
+        result = _DECODE_VALIDATES[field_type] = owner.__module__ == StrField.__module__
+    return result
+
+
+def _is_plain(field: Field) -> bool:
+    return field.default is None and field.default_factory is None
+
+
+def _is_inlined(field: Field) -> bool:
+    if not _is_plain(field):
+        return False
+    if type(field) in PRIMITIVE_FIELD_TYPES:
+        return True
+    if type(field) is ObjectField:
+        return hasattr(field.obj_type, '_decode')
+    if type(field) is ListField:
+        return _is_inlined(field.obj_type) and type(field.obj_type) is not ListField
+    return False
+
+
+class _Source:
+    def __init__(self, namespace: dict):
+        self.lines = []
+        self.namespace = namespace
+
+    def emit(self, indent: int, line: str):
+        self.lines.append('    ' * indent + line)
+
+    def const(self, name: str, value) -> str:
+        self.namespace[name] = value
+        return name
+
+
+def _emit_element_check(src: _Source, indent: int, field: Field, i: int, attr: str, value: str, index: str,
+                        target: str):
+    """
+    Validates and converts one list element, `target` receives the converted value
+    """
+    if type(field) in PRIMITIVE_FIELD_TYPES:
+        py_type = PRIMITIVE_FIELD_TYPES[type(field)]
+        src.emit(indent, f'if type({value}) is not {src.const(py_type.__name__, py_type)}:')
+        src.emit(indent + 1, f"raise DataValidationError(f'{attr}.[{{{index}}}]', '')")
+        src.emit(indent, f'{target}({value})')
+    else:
+        obj_type = src.const(f'c{i}', field.obj_type)
+        src.emit(indent, f'if type({value}) is not dict:')
+        src.emit(indent + 1, f"raise DataValidationError(f'{attr}.[{{{index}}}]', '')")
+        src.emit(indent, 'try:')
+        src.emit(indent + 1, f'{target}({obj_type}._decode({value}))')
+        src.emit(indent, 'except DataValidationError as e:')
+        src.emit(indent + 1, f"raise DataValidationError(_join_path(f'{attr}.[{{{index}}}]', e.path), e.err)")
+
+
+def _emit_inlined_decode(src: _Source, indent: int, field: Field, i: int, attr: str):
+    if type(field) in PRIMITIVE_FIELD_TYPES:
+        py_type = PRIMITIVE_FIELD_TYPES[type(field)]
+        src.emit(indent, f'if type(v) is not {src.const(py_type.__name__, py_type)}:')
+        src.emit(indent + 1, f'raise _pre_check_error({attr!r}, v)')
+        src.emit(indent, f'self.{attr} = v')
+    elif type(field) is ObjectField:
+        obj_type = src.const(f'c{i}', field.obj_type)
+        src.emit(indent, 'if type(v) is not dict:')
+        src.emit(indent + 1, f'raise _pre_check_error({attr!r}, v)')
+        src.emit(indent, 'try:')
+        src.emit(indent + 1, f'self.{attr} = {obj_type}._decode(v)')
+        src.emit(indent, 'except DataValidationError as e:')
+        src.emit(indent + 1, f'raise DataValidationError(_join_path({attr!r}, e.path), e.err)')
+    else:
+        src.emit(indent, 'if type(v) is not list:')
+        src.emit(indent + 1, f'raise _pre_check_error({attr!r}, v)')
+        src.emit(indent, 'values = []')
+        src.emit(indent, 'append = values.append')
+        src.emit(indent, 'for index, e in enumerate(v):')
+        _emit_element_check(src, indent + 1, field.obj_type, i, attr, 'e', 'index', 'append')
+        src.emit(indent, f'self.{attr} = values')
+
+
+def _emit_generic_decode(src: _Source, field: Field, i: int, attr: str, key: str):
+    f = src.const(f'f{i}', field)
+
+    def validate_missing(indent: int):
+        src.emit(indent, 'try:')
+        src.emit(indent + 1, f'{f}.validate_dict({attr!r}, v)')
+        src.emit(indent, 'except DataValidationError as e:')
+        src.emit(indent + 1, f'raise DataValidationError(_join_path({attr!r}, e.path), e.err)')
+        src.emit(indent, 'except AssertionError as e:')
+        src.emit(indent + 1, f'raise _pre_check_error({attr!r}, v, e)')
+
+    src.emit(1, f'v = d.get({key})')
+    src.emit(1, 'if v is not None:')
+    src.emit(2, 'try:')
+    src.emit(3, f'self.{attr} = {f}.decode({attr!r}, v)')
+    src.emit(2, 'except DataValidationError as e:')
+    src.emit(3, f'raise DataValidationError(_join_path({attr!r}, e.path), e.err)')
+    src.emit(2, 'except AssertionError as e:')
+    src.emit(3, f'raise _pre_check_error({attr!r}, v, e)')
+    src.emit(1, 'else:')
+    src.emit(2, f'v = d.get({key}, {f}.default)')
+    if field.required:
+        validate_missing(2)
+        src.emit(2, f'self.{attr} = {f}.from_dict(None)')
+    else:
+        src.emit(2, 'if v is not None:')
+        validate_missing(3)
+        src.emit(2, f'self.{attr} = None')
+
+
+def _emit_defaults(src: _Source, field: Field, i: int, attr: str):
+    f = src.const(f'f{i}', field)
+    src.emit(1, f'if self.{attr} is None:')
+    if field.default is not None:
+        src.emit(2, f'self.{attr} = {f}.default')
+    else:
+        src.emit(2, f'func, args, kwargs = {f}.default_factory')
+        src.emit(2, f'self.{attr} = func(*args, **kwargs)')
+
+
+def _emit_post_check(src: _Source, field: Field, i: int, attr: str, key: str):
+    """
+    Values decoded from the dict are trusted, only defaults and missing values are checked here (all values of
+    fields whose validate() is not covered by decode())
+    """
+    f = src.const(f'f{i}', field)
+
+    def validate(indent: int):
+        src.emit(indent, 'try:')
+        src.emit(indent + 1, f'{f}.validate({attr!r}, v)')
+        src.emit(indent, 'except DataValidationError as e:')
+        src.emit(indent + 1, f'raise DataValidationError(_join_path({attr!r}, e.path), e.err)')
+        src.emit(indent, 'except AssertionError:')
+        src.emit(indent + 1, f'raise _post_check_error({attr!r}, v)')
+
+    src.emit(1, f'v = self.{attr}')
+    if not _decode_validates(field):
+        if field.required:
+            validate(1)
+            return
+        src.emit(1, 'if v is not None:')
+    elif field.required:
+        src.emit(1, f'if d.get({key}) is None:')
+    else:
+        src.emit(1, f'if v is not None and d.get({key}) is None:')
+    validate(2)
+
+
+def _compile_decoder(fields: Dict[str, Field], keys: Dict[str, str]) -> Callable:
+    src = _Source({
+        'DataValidationError': DataValidationError,
+        '_join_path': _join_path,
+        '_pre_check_error': _pre_check_error,
+        '_post_check_error': _post_check_error,
+    })
+    src.emit(0, 'def decode(self, d):')
+    for i, (attr, field) in enumerate(fields.items()):
+        key = src.const(f'k{i}', keys[attr])
+        if not _is_inlined(field):
+            _emit_generic_decode(src, field, i, attr, key)
+            continue
+        src.emit(1, f'v = d.get({key})')
+        if field.required:
+            _emit_inlined_decode(src, 1, field, i, attr)
+        else:
+            src.emit(1, 'if v is None:')
+            src.emit(2, f'self.{attr} = None')
+            src.emit(1, 'else:')
+            _emit_inlined_decode(src, 2, field, i, attr)
+    for i, (attr, field) in enumerate(fields.items()):
+        if not _is_plain(field):
+            _emit_defaults(src, field, i, attr)
+    for i, (attr, field) in enumerate(fields.items()):
+        if not _is_inlined(field):
+            _emit_post_check(src, field, i, attr, f'k{i}')
+    src.emit(1, 'try:')
+    src.emit(2, 'self.validate()')
+    src.emit(1, 'except AssertionError as e:')
+    src.emit(2, "raise DataValidationError('.', f'Validation failed with error: {str(e)}')")
+    exec('\n'.join(src.lines), src.namespace)
+    return src.namespace['decode']
+
+
+def _trusted_expression(src: _Source, field: Field, i: int, value: str) -> str:
+    if type(field) in PRIMITIVE_FIELD_TYPES:
+        return value
+    if type(field) is ObjectField:
+        return f"{src.const(f'c{i}', field.obj_type)}.from_trusted({value})"
+    if type(field) is ListField and type(field.obj_type) in PRIMITIVE_FIELD_TYPES:
+        return f'list({value})'
+    return f"{src.const(f'f{i}', field)}.from_trusted({value})"
+
+
+def _compile_trusted_decoder(fields: Dict[str, Field], keys: Dict[str, str]) -> Callable:
+    src = _Source({})
+    src.emit(0, 'def decode_trusted(self, d):')
+    for i, (attr, field) in enumerate(fields.items()):
+        key = src.const(f'k{i}', keys[attr])
+        src.emit(1, f'v = d.get({key})')
+        src.emit(1, f'self.{attr} = None if v is None else {_trusted_expression(src, field, i, "v")}')
+    for i, (attr, field) in enumerate(fields.items()):
+        if not _is_plain(field):
+            _emit_defaults(src, field, i, attr)
+    if len(fields) == 0:
+        src.emit(1, 'pass')
+    exec('\n'.join(src.lines), src.namespace)
+    return src.namespace['decode_trusted']
+
+
+def _encode_expression(src: _Source, field: Field, i: int, value: str) -> str:
+    if type(field) in PRIMITIVE_FIELD_TYPES:
+        return value
+    if type(field) is ObjectField:
+        return f'None if {value} is None else {value}.to_dict(skip_optional)'
+    if type(field) is ListField and type(field.obj_type) in PRIMITIVE_FIELD_TYPES:
+        return f'list({value})'
+    if type(field) is ListField and type(field.obj_type) is ObjectField:
+        return f'[None if e is None else e.to_dict(skip_optional) for e in {value}]'
+    return f"{src.const(f'f{i}', field)}.to_dict({value}, skip_optional)"
+
+
+def _compile_encoder(fields: Dict[str, Field], keys: Dict[str, str]) -> Callable:
+    src = _Source({})
+    src.emit(0, 'def encode(self, skip_optional):')
+    src.emit(1, 'd = {}')
+    for i, (attr, field) in enumerate(fields.items()):
+        key = src.const(f'k{i}', keys[attr])
+        src.emit(1, f'v = self.{attr}')
+        if not field.required:
+            src.emit(1, 'if v is None:')
+            src.emit(2, 'if not skip_optional:')
+            src.emit(3, f'd[{key}] = None')
+            src.emit(1, 'else:')
+            src.emit(2, f'd[{key}] = {_encode_expression(src, field, i, "v")}')
+        else:
+            src.emit(1, f'd[{key}] = {_encode_expression(src, field, i, "v")}')
+    src.emit(1, 'return d')
+    exec('\n'.join(src.lines), src.namespace)
+    return src.namespace['encode']
+
+
+def compile_codecs(fields: Dict[str, Field], keys: Dict[str, str]) -> Optional[Tuple[Callable, Callable, Callable]]:
+    """
+    Generates a (decode, encode, decode_trusted) triple specialised for the given fields, similar to how dataclasses
+    generate __init__. decode(self, d) fills a blank instance from a raw dict, encode(self, skip_optional) returns its
+    dict and decode_trusted(self, d) fills the instance without validating.
+    Returns None when the fields can not be compiled, the caller should use the generic path then.
+    """
+    for attr, field in fields.items():
+        if not attr.isidentifier() or keyword.iskeyword(attr) or (field.required and field.default is not None):
+            return None
+    return _compile_decoder(fields, keys), _compile_encoder(fields, keys), _compile_trusted_decoder(fields, keys)
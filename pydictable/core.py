@@ -1,17 +1,52 @@
+import asyncio
+import functools
 import inspect
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime
 from enum import Enum
-from typing import Dict, get_type_hints, Union, Type, Any
+from typing import Dict, get_type_hints, Union, Type, Any, Iterable, List, Iterator, IO, Tuple, Callable
 
+from pydictable.codegen import compile_codecs, _pre_check_error, _post_check_error, _decode_validates
+from pydictable.json_codec import encode_str, dumps, fragment, skip_ws, scan_value, iter_object, locate, byte_offset, \
+    get_json_backend
 from pydictable.field import StrField, IntField, FloatField, BoolField, ListField, UnionField, NoneField, \
-    ObjectField, DataValidationError, EnumField, DatetimeField, DictField, AnyField
-from pydictable.type import _BaseDictAble, Field
+    ObjectField, DataValidationError, ValidationErrors, EnumField, DatetimeField, DictField, AnyField, DictValueField, \
+    MultiTypeField, ArrayField, ARRAY_TYPES, _join_path
+from pydictable.stream import iter_jsonl, iter_json_array, DEFAULT_CHUNK_SIZE
+from pydictable.type import _BaseDictAble, _LazyAttribute, Field, register_dynamic_class, get_generation, \
+    get_generations, invalidate_fields
 
 
 class InvalidSchema(Exception):
     pass
 
 
+class BatchValidationError(DataValidationError):
+    """
+    Raised by DictAble.from_dicts(collect_errors=True), `errors` has one DataValidationError per failed row
+    """
+
+    def __init__(self, errors: List[DataValidationError]):
+        super(BatchValidationError, self).__init__(errors[0].path, f'{len(errors)} rows failed validation')
+        self.errors = errors
+
+
+class JsonValidationError(DataValidationError):
+    """
+    Raised by DictAble.from_json, `offset` is the byte offset in the UTF-8 document of the deepest value
+    of the error path found in it
+    """
+
+    def __init__(self, path: str, err, offset: int):
+        super(JsonValidationError, self).__init__(path, err)
+        self.offset = offset
+
+
+def _row_error(index: int, e: DataValidationError) -> DataValidationError:
+    return DataValidationError(f'[{index}]' if e.path == '.' else f'[{index}].{e.path}', e.err)
+
+
 TYPE_TO_FIELD = {
     str: StrField,
     int: IntField,
@@ -24,22 +59,61 @@ TYPE_TO_FIELD = {
     Any: AnyField
 }
 
+# Fields whose values are passed through as they are by to_dict, given to to_columns without a call per value
+PLAIN_FIELD_TYPES = (StrField, IntField, FloatField, BoolField)
+
+# Values (list and dict elements, object fields) walked by afrom_dict/avalidate_dict between two yields to the event loop
+ASYNC_CHUNK_SIZE = 1000
+
+# Fields building nested objects or containers, kept raw until first read on lazy classes
+LAZY_FIELD_TYPES = (ObjectField, ListField, DictField, DictValueField, MultiTypeField, UnionField)
+
 
 class DictAble(_BaseDictAble):
+    __slots__ = ()
+    _compiled = False
+    _compact = False
+    _lazy = False
+
+    def __init_subclass__(cls, compiled: bool = None, lazy: bool = None, **kwargs):
+        """
+        Pass `compiled=True` in the class statement to decode/encode through generated per-class functions.
+        `compact=True` (handled by the metaclass) stores the fields in __slots__ instead of a per instance __dict__,
+        the Field objects are then only reachable through get_fields() and no field can be added later.
+        `lazy=True` validates nested objects and containers up front but only builds them on first read, an
+        untouched one is given back as received by to_dict() when it would come out the same. Fields referring to
+        classes with a validate() hook or their own __init__ are built up front. The raw values are not copied:
+        the instance reads the dicts and lists it was given, they must not be changed afterwards.
+        """
+        super(DictAble, cls).__init_subclass__(**kwargs)
+        if compiled is not None:
+            cls._compiled = compiled
+        if lazy is not None:
+            cls._lazy = lazy
+        if cls._lazy and cls._compact:
+            raise TypeError(f'{cls.__name__} can not be both lazy and compact')
+
     def __init__(self, *args, **kwargs):
+        if self._compiled and not args and len(kwargs) == 1 and kwargs.get('dict'):
+            codecs = self.__get_codecs()
+            if codecs is not None:
+                codecs[0](self, kwargs['dict'])
+                return
         super(DictAble, self).__init__(*args, **kwargs)
         self.__clear_default_field_values()
-        fields = self.get_fields()
+        fields = self.__get_fields_cache()[1]
         for k, v in kwargs.items():
             if k in fields:
                 self.__setattr__(k, v)
         if kwargs.get('dict'):
-            self.validate_dict(kwargs['dict'])
             self.__apply_dict(kwargs['dict'])
         if len(args) > 0:
             raise ReferenceError('Use kwargs to init DictAble')
+        self.__finish(kwargs.get('dict'))
+
+    def __finish(self, raw_values: dict = None):
         self.__set_defaults()
-        self.__validate()
+        self.__validate(raw_values)
         try:
             self.validate()
         except AssertionError as e:
@@ -102,18 +176,27 @@ class DictAble(_BaseDictAble):
         return field_type(required=True)
 
     @classmethod
-    def get_fields(cls) -> Dict[str, Field]:
+    def __build_fields(cls) -> Dict[str, Field]:
         fields = {}
         for attr in inspect.getmembers(cls):
             if isinstance(attr[1], Field):
+                static = inspect.getattr_static(cls, attr[0])
+                if isinstance(static, _LazyAttribute) and not static.declared:
+                    continue  # built from the type hint again below
                 fields[attr[0]] = attr[1]
+        for klass in cls.__mro__:
+            # compact classes keep their Field objects aside, the class attributes are slots
+            for name, field in klass.__dict__.get('_slot_fields', {}).items():
+                fields.setdefault(name, field)
         for name, th in get_type_hints(cls).items():
             if name not in fields:
                 fields[name] = cls.__get_field_by_type_hint(th)
 
         ordered_fields = {}
-        for name in dict(vars(cls)).keys():
-            if name in fields:
+        # slot descriptors are listed sorted in vars(), compact classes use their own declaration order
+        declared = cls.__dict__['_slot_fields'] if '_slot_fields' in cls.__dict__ else vars(cls)
+        for name, value in dict(declared).items():
+            if name in fields and not (isinstance(value, _LazyAttribute) and not value.declared):
                 ordered_fields[name] = fields[name]
         for k, v in fields.items():
             if k not in ordered_fields:
@@ -122,54 +205,545 @@ class DictAble(_BaseDictAble):
         assert set(fields.keys()) == set(ordered_fields.keys())
         return ordered_fields
 
+    @classmethod
+    def __get_fields_cache(cls) -> tuple:
+        # (generation, fields, field keys, lazy field names); rebuilt only after a Field is (re)assigned
+        # on this class or one of its bases
+        cache = cls.__dict__.get('_DictAble__fields_cache')
+        if cache is None or cache[0] != get_generation(cls):
+            generation = get_generation(cls)
+            fields = cls.__build_fields()
+            keys = {attr: field.key if field.key else attr for attr, field in fields.items()}
+            lazy = frozenset()
+            if cls._lazy:
+                lazy = frozenset(attr for attr, field in fields.items() if isinstance(field, LAZY_FIELD_TYPES))
+                for attr in lazy:
+                    cls.__install_lazy_attribute(attr, fields[attr])
+            cache = (generation, fields, keys, lazy)
+            type.__setattr__(cls, '_DictAble__fields_cache', cache)
+        return cache
+
+    @classmethod
+    def __install_lazy_attribute(cls, attr: str, field: Field):
+        current = inspect.getattr_static(cls, attr, None)
+        if isinstance(current, _LazyAttribute) and current.field is field:
+            return
+        own = cls.__dict__.get(attr)
+        declared = own is field or (isinstance(own, _LazyAttribute) and own.declared)
+        type.__setattr__(cls, attr, _LazyAttribute(attr, field, declared))
+
+    @classmethod
+    def __get_raw_kept(cls) -> frozenset:
+        # (dependencies, lazy field names kept raw while decoding), building the other ones runs validate() hooks
+        # or __init__ overrides of the classes they refer to, which have to run up front
+        cache = cls.__dict__.get('_DictAble__raw_kept')
+        if cache is None or cache[0] != cls._dependencies():
+            _, fields, _, lazy = cls.__get_fields_cache()
+            kept = frozenset(
+                attr for attr in lazy
+                if not any(_runs_hooks(klass) for ref in _field_refs(fields[attr]) for klass in _reachable(ref))
+            )
+            cache = (cls._dependencies(), kept)
+            type.__setattr__(cls, '_DictAble__raw_kept', cache)
+        return cache[1]
+
+    @classmethod
+    def _round_trips(cls, raw_values: dict, skip_optional: bool) -> bool:
+        """
+        Whether to_dict of the object built from a validated raw dict gives the same dict back: no unknown keys,
+        no default to fill in and every optional key present (None) or absent as skip_optional has it
+        """
+        # (generation, [(key, field unless to_dict passes its values through, whether it has no default)]), None
+        # for classes encoding themselves
+        cache = cls.__dict__.get('_DictAble__round_trip_plan')
+        if cache is None or cache[0] != get_generation(cls):
+            generation = get_generation(cls)
+            _, fields, keys, _ = cls.__get_fields_cache()
+            plan = None
+            if cls.to_dict is DictAble.to_dict and cls._write_json is DictAble._write_json:
+                plan = [
+                    (keys[attr], None if type(field) in PLAIN_FIELD_TYPES else field,
+                     field.default is None and not field.default_factory)
+                    for attr, field in fields.items()
+                ]
+            cache = (generation, plan)
+            type.__setattr__(cls, '_DictAble__round_trip_plan', cache)
+        plan = cache[1]
+        if plan is None or len(raw_values) > len(plan):
+            return False
+        present = 0
+        for key, field, no_default in plan:
+            value = raw_values.get(key)
+            if value is None:
+                if not no_default or (key in raw_values) == skip_optional:
+                    return False
+                present += key in raw_values
+            elif field is None or _round_trips(field, value, skip_optional):
+                present += 1
+            else:
+                return False
+        return present == len(raw_values)
+
+    @classmethod
+    def __get_codecs(cls) -> tuple:
+        cache = cls.__dict__.get('_DictAble__codecs')
+        if cache is None or cache[0] != get_generation(cls):
+            _, fields, keys, lazy = cls.__get_fields_cache()
+            cache = (get_generation(cls), None if lazy else compile_codecs(fields, keys))
+            type.__setattr__(cls, '_DictAble__codecs', cache)
+        return cache[1]
+
+    @classmethod
+    def _decode(cls, d: dict) -> 'DictAble':
+        """
+        Builds an instance from a raw dict visiting every value once, used for nested objects.
+        Unlike cls(dict=d) it does not go through __init__ and an empty dict is validated too, classes overriding
+        __init__ are built with cls(dict=d) though.
+        """
+        if cls.__init__ is not DictAble.__init__:
+            return cls(dict=d)
+        obj = cls.__new__(cls)
+        codecs = cls.__get_codecs() if cls._compiled else None
+        if codecs is not None:
+            codecs[0](obj, d)
+            return obj
+        obj.__clear_default_field_values()
+        obj.__apply_dict(d)
+        obj.__finish(d)
+        return obj
+
+    @classmethod
+    def from_trusted(cls, raw_values: dict) -> 'DictAble':
+        """
+        Builds an instance from data already known to be valid, like an earlier to_dict() output.
+        Values are only converted (nested objects, lists, datetimes, enums...) and defaults applied,
+        neither the fields nor the validate() hook are checked. Classes overriding __init__ are built and checked
+        with cls(dict=raw_values).
+        """
+        if cls.__init__ is not DictAble.__init__:
+            return cls(dict=raw_values)
+        obj = cls.__new__(cls)
+        codecs = cls.__get_codecs() if cls._compiled else None
+        if codecs is not None:
+            codecs[2](obj, raw_values)
+            return obj
+        _, fields, keys, lazy = cls.__get_fields_cache()
+        pending = None
+        if lazy:
+            pending = obj._lazy_raw = {}
+        for attr, field in fields.items():
+            value = raw_values.get(keys[attr])
+            if value is not None and attr in lazy:
+                pending[attr] = value
+                continue
+            obj.__setattr__(attr, None if value is None else field.from_trusted(value))
+        obj.__set_defaults()
+        return obj
+
+    @classmethod
+    def __iter_decoded(cls, rows: Iterator, yield_errors: bool,
+                       start: int = 0) -> Iterator[Union['DictAble', DataValidationError]]:
+        # The decoder is looked up once for all rows
+        codecs = cls.__get_codecs() if cls._compiled else None
+        decode = codecs[0] if codecs is not None and cls.__init__ is DictAble.__init__ else None
+        new = cls.__new__
+        for i, row in enumerate(rows, start):
+            try:
+                if type(row) is not dict:
+                    raise DataValidationError('.', f'Expected a dict, got {type(row).__name__}')
+                if decode is not None:
+                    obj = new(cls)
+                    decode(obj, row)
+                else:
+                    obj = cls._decode(row)
+            except DataValidationError as e:
+                if not yield_errors:
+                    raise _row_error(i, e)
+                yield _row_error(i, e)
+                continue
+            yield obj
+
+    @classmethod
+    def from_dicts(cls, rows: Iterable[dict], collect_errors: bool = False) -> List['DictAble']:
+        """
+        Decodes many rows of the same model, error paths are prefixed with the row index like [12].address.pin_code.
+        With collect_errors every row is decoded and a BatchValidationError with all failures is raised at the end.
+        """
+        objs, errors = [], []
+        for obj in cls.__iter_decoded(iter(rows), collect_errors):
+            if isinstance(obj, DataValidationError):
+                errors.append(obj)
+            else:
+                objs.append(obj)
+        if errors:
+            raise BatchValidationError(errors)
+        return objs
+
+    @classmethod
+    def _decode_chunk(cls, rows: List[dict], start: int) -> List[Union['DictAble', DataValidationError]]:
+        return list(cls.__iter_decoded(iter(rows), True, start))
+
+    @classmethod
+    def validate_many(cls, rows: Iterable[dict], workers: int = None,
+                      chunksize: int = 1000) -> List[Union['DictAble', DataValidationError]]:
+        """
+        Decodes rows across a pool of `workers` processes (all cores by default), `chunksize` rows per task.
+        Returns, in input order, the instance or the DataValidationError (path prefixed with the row index) of each row.
+        Classes made by partial() and GenericDictAble.make() are re-created by their recipe in the workers.
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(rows) <= chunksize:
+            return cls._decode_chunk(rows, 0)
+        starts = range(0, len(rows), chunksize)
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(cls._decode_chunk, rows[start:start + chunksize], start) for start in starts]
+            for future in futures:
+                results.extend(future.result())
+        return results
+
+    @classmethod
+    def iter_from_jsonl(cls, fileobj: IO, yield_errors: bool = False) -> Iterator[Union['DictAble', DataValidationError]]:
+        """
+        Lazily decodes a JSON Lines file object (text, binary or mmap), holding one record in memory at a time.
+        Invalid records raise, or are yielded as DataValidationError with the record index in the path if
+        yield_errors is set.
+        """
+        return cls.__iter_decoded(iter_jsonl(fileobj), yield_errors)
+
+    @classmethod
+    def iter_from_json_array(cls, fileobj: IO, yield_errors: bool = False,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Union['DictAble', DataValidationError]]:
+        """
+        Like iter_from_jsonl, for a file holding one big JSON array which is read in chunks
+        """
+        return cls.__iter_decoded(iter_json_array(fileobj, chunk_size), yield_errors)
+
+    @classmethod
+    def from_json(cls, data: Union[str, bytes], backend: str = None) -> 'DictAble':
+        """
+        Same as cls(dict=json.loads(data)), parsed by the JSON backend (see get_json_backend).
+        Invalid values raise JsonValidationError with their offset, malformed JSON raises json.JSONDecodeError
+        unless a wrong value comes before the syntax error: the fields are then checked member by member, so it is
+        rejected like in a well formed document.
+        """
+        json_backend = get_json_backend(backend)
+        try:
+            try:
+                raw = json_backend.loads(data)
+            except ValueError:
+                cls.__scan_json(data if isinstance(data, str) else str(data, 'utf-8'))
+                raise
+            if type(raw) is not dict:
+                raise DataValidationError('.', f'Expected a dict, got {type(raw).__name__}')
+            return cls(dict=raw)
+        except DataValidationError as e:
+            s = data if isinstance(data, str) else str(data, 'utf-8')
+            start = skip_ws(s, 0)
+            raise JsonValidationError(e.path, e.err, byte_offset(s, locate(s, start, cls.__json_segments(e.path))))
+
+    @classmethod
+    def __scan_json(cls, s: str):
+        # Checks the top level members of a malformed document one by one up to the syntax error, which is raised
+        start = skip_ws(s, 0)
+        if s[start:start + 1] != '{':
+            scan_value(s, start)
+            return
+        _, fields, keys, _ = cls.__get_fields_cache()
+        attrs = {key: attr for attr, key in keys.items()}
+        for key, value, _, _ in iter_object(s, start):
+            attr = attrs.get(key)
+            if attr is not None and value is not None:
+                cls.__validate_field_dict(attr, fields[attr], value)
+
+    @classmethod
+    async def afrom_dict(cls, raw_values: dict, chunk_size: int = ASYNC_CHUNK_SIZE,
+                         executor: Executor = None) -> 'DictAble':
+        """
+        Same as cls(dict=raw_values) without holding the event loop for long: lists and dicts are decoded
+        `chunk_size` elements at a time and nested objects field by field, with a yield to the loop every
+        `chunk_size` elements. raw_values must not be changed meanwhile.
+        With an executor (thread or process pool) cls(dict=raw_values) runs there instead.
+        """
+        if executor is not None:
+            return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(cls, dict=raw_values))
+        if type(raw_values) is not dict or not raw_values:
+            return cls(dict=raw_values)
+        return await cls._adecode(raw_values, _Budget(chunk_size))
+
+    @classmethod
+    async def avalidate_dict(cls, raw_values: dict, chunk_size: int = ASYNC_CHUNK_SIZE, executor: Executor = None):
+        """
+        validate_dict, cooperatively or in an executor like afrom_dict
+        """
+        if executor is not None:
+            return await asyncio.get_running_loop().run_in_executor(executor, cls.validate_dict, raw_values)
+        await cls._avalidate(raw_values, _Budget(chunk_size))
+
+    @classmethod
+    async def _adecode(cls, raw_values: dict, budget: '_Budget') -> 'DictAble':
+        # _decode, awaiting the walk of every present value
+        if cls.__init__ is not DictAble.__init__:
+            return cls(dict=raw_values)
+        _, fields, keys, lazy = cls.__get_fields_cache()
+        if lazy:
+            lazy = cls.__get_raw_kept()
+        await budget.spend(len(fields))
+        obj = cls.__new__(cls)
+        obj.__clear_default_field_values()
+        applied = set()
+        for attr, field in fields.items():
+            value = raw_values.get(keys[attr])
+            if value is None:
+                continue
+            try:
+                decoded = await _awalk(field, attr, value, budget, attr not in lazy)
+            except DataValidationError as e:
+                raise DataValidationError(_join_path(attr, e.path), e.err)
+            except AssertionError as e:
+                raise _pre_check_error(attr, value, e)
+            if attr in lazy:
+                del obj.__dict__[attr]
+                obj._lazy_raw[attr] = value
+            else:
+                obj.__setattr__(attr, decoded)
+            applied.add(attr)
+        obj.__apply_dict(raw_values, applied)
+        obj.__finish(raw_values)
+        return obj
+
+    @classmethod
+    async def _avalidate(cls, raw_values: dict, budget: '_Budget'):
+        # validate_dict, awaiting the walk of every value
+        if type(raw_values) is not dict:
+            raise DataValidationError('.', f'Expected a dict, got {type(raw_values).__name__}')
+        _, fields, keys, _ = cls.__get_fields_cache()
+        await budget.spend(len(fields))
+        for attr, field in fields.items():
+            value = raw_values.get(keys[attr], field.default)
+            if value is None and not field.required:
+                continue
+            try:
+                await _awalk(field, attr, value, budget, False)
+            except DataValidationError as e:
+                raise DataValidationError(_join_path(attr, e.path), e.err)
+            except AssertionError as e:
+                raise _pre_check_error(attr, value, e)
+
+    @classmethod
+    def __json_segments(cls, path: str) -> list:
+        # The JSON keys and array indexes along an error path, attrs are mapped to their keys where known
+        segments, owner = [], cls
+        for part in path.split('.'):
+            if not part:
+                continue
+            if part[0] == '[' and part[-1] == ']' and part[1:-1].isdigit():
+                segments.append(int(part[1:-1]))
+                continue
+            fields = owner.get_fields() if isinstance(owner, type) and issubclass(owner, DictAble) else {}
+            field = fields.get(part)
+            segments.append(owner.get_field_key(part) if field is not None else part)
+            while isinstance(field, ListField):
+                field = field.obj_type
+            owner = field.obj_type if isinstance(field, ObjectField) else None
+        return segments
+
+    @classmethod
+    def to_dicts(cls, objs: Iterable['DictAble'], skip_optional: bool = False) -> List[dict]:
+        codecs = cls.__get_codecs() if cls._compiled else None
+        if codecs is None:
+            return [obj.to_dict(skip_optional) for obj in objs]
+        encode = codecs[1]
+        return [encode(obj, skip_optional) if type(obj) is cls else obj.to_dict(skip_optional) for obj in objs]
+
+    @classmethod
+    def __get_column_plan(cls) -> list:
+        # [(attr, key, field, plan of the nested class or None)], nested objects are flattened unless recursive
+        cache = cls.__dict__.get('_DictAble__column_plan')
+        if cache is None or cache[0] != cls._dependencies():
+            dependencies = cls._dependencies()
+            _, fields, keys, _ = cls.__get_fields_cache()
+            plan = []
+            for attr, field in fields.items():
+                children = None
+                if type(field) is ObjectField and issubclass(field.obj_type, DictAble) \
+                        and not field.obj_type.is_recursive():
+                    children = field.obj_type.__get_column_plan()
+                plan.append((attr, keys[attr], field, children))
+            cache = (dependencies, plan)
+            type.__setattr__(cls, '_DictAble__column_plan', cache)
+        return cache[1]
+
+    @classmethod
+    def to_columns(cls, objs: Iterable['DictAble'], arrays: bool = False) -> Dict[str, list]:
+        """
+        Encodes many objects into {key: [value per object]} without a dict per object. Nested objects are flattened
+        into dotted keys like address.lat_lng.lat, their values are None where the object is None. The column of
+        the nested prefix itself, like address.lat_lng, tells whether the object is present.
+        With arrays=True the int, float and bool columns holding no None are stored like ArrayField does.
+        """
+        columns = {}
+        _fill_columns(cls.__get_column_plan(), objs if isinstance(objs, list) else list(objs), '', columns, arrays)
+        return columns
+
+    @classmethod
+    def __iter_column_rows(cls, columns: Dict[str, list]) -> Iterator[dict]:
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f'Columns have different lengths {sorted(lengths)}')
+        rows = _iter_rows(cls.__get_column_plan(), columns, '')
+        return rows if rows is not None else ({} for _ in range(lengths.pop() if lengths else 0))
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, list], collect_errors: bool = False) -> List['DictAble']:
+        """
+        The inverse of to_columns, decodes like from_dicts with the row index in error paths. Rows are assembled
+        one at a time from the columns. A nested object without a presence column is read as None where its values
+        are all None.
+        """
+        return cls.from_dicts(cls.__iter_column_rows(columns), collect_errors)
+
+    @classmethod
+    def validate_columns(cls, columns: Dict[str, list]):
+        """
+        Like from_columns without building any object, validate() hooks are not run
+        """
+        for i, row in enumerate(cls.__iter_column_rows(columns)):
+            try:
+                cls.validate_dict(row)
+            except DataValidationError as e:
+                raise _row_error(i, e)
+
+    @classmethod
+    def get_fields(cls) -> Dict[str, Field]:
+        return dict(cls.__get_fields_cache()[1])
+
     @classmethod
     def get_field_key(cls, obj_attr: str):
-        field = cls.get_fields()[obj_attr]
-        return field.key if field.key else obj_attr
+        return cls.__get_fields_cache()[2][obj_attr]
 
     def __clear_default_field_values(self):
-        for attr, field in self.__class__.get_fields().items():
+        _, fields, _, lazy = self.__get_fields_cache()
+        if lazy:
+            # one call for all fields, lazy classes always have a __dict__
+            self.__dict__.update(dict.fromkeys(fields))
+            self._lazy_raw = {}
+            return
+        for attr in fields:
             self.__setattr__(attr, None)
 
-    def __apply_dict(self, d: dict):
-        for attr, field in self.__class__.get_fields().items():
-            value = d.get(self.get_field_key(attr))
-            if not field.required and value is None:
+    def __apply_value(self, attr: str, field: Field, value, lazy: frozenset):
+        # Validates and converts a present value in one go, see Field.decode
+        if attr in lazy:
+            self.__validate_field_dict(attr, field, value)
+            del self.__dict__[attr]  # reads now go through the _LazyAttribute
+            self._lazy_raw[attr] = value
+            return
+        try:
+            self.__setattr__(attr, field.decode(attr, value))
+        except DataValidationError as e:
+            raise DataValidationError(_join_path(attr, e.path), e.err)
+        except AssertionError as e:
+            raise _pre_check_error(attr, value, e)
+
+    def __apply_dict(self, d: dict, applied: set = ()):
+        # `applied` are the attrs whose present value was already given to __apply_value
+        _, fields, keys, lazy = self.__get_fields_cache()
+        if lazy:
+            lazy = self.__get_raw_kept()
+        for attr, field in fields.items():
+            value = d.get(keys[attr])
+            if value is not None:
+                if attr not in applied:
+                    self.__apply_value(attr, field, value, lazy)
+                continue
+            value = d.get(keys[attr], field.default)
+            if value is None and not field.required:
                 continue
-            self.__setattr__(attr, field.from_dict(value))
+            self.__validate_field_dict(attr, field, value)
+            if field.required:
+                self.__setattr__(attr, field.from_dict(None))
+
+    @classmethod
+    def __validate_field_dict(cls, attr: str, field: Field, value):
+        try:
+            field.validate_dict(attr, value)
+        except DataValidationError as e:
+            raise DataValidationError(_join_path(attr, e.path), e.err)
+        except AssertionError as e:
+            raise _pre_check_error(attr, value, e)
 
     @classmethod
     def validate_dict(cls, raw_values: dict):
-        for attr, field in cls.get_fields().items():
-            value = raw_values.get(cls.get_field_key(attr), field.default)
+        """
+        Accepts or rejects a raw dict without building any object, validate() hooks are not run
+        """
+        if type(raw_values) is not dict:
+            raise DataValidationError('.', f'Expected a dict, got {type(raw_values).__name__}')
+        _, fields, keys, _ = cls.__get_fields_cache()
+        for attr, field in fields.items():
+            value = raw_values.get(keys[attr], field.default)
+            if value is None and not field.required:
+                continue
+            cls.__validate_field_dict(attr, field, value)
+
+    @classmethod
+    def collect_errors(cls, raw_values: dict, max_errors: int = None) -> List[Tuple[str, str]]:
+        """
+        Walks the whole raw dict once and returns a (path, message) pair for every problem, [] when it is valid.
+        Paths read like DataValidationError.path, e.g. address.lat_lng.lat or tags.[3]. The walk stops after
+        max_errors errors. Like validate_dict no object is built and validate() hooks are not run.
+        """
+        errors = ValidationErrors(max_errors)
+        if type(raw_values) is not dict:
+            errors.add(None, f'Expected a dict, got {type(raw_values).__name__}')
+        else:
+            cls._collect_errors(raw_values, errors)
+        return errors.errors
+
+    @classmethod
+    def _collect_errors(cls, raw_values: dict, errors: ValidationErrors):
+        _, fields, keys, _ = cls.__get_fields_cache()
+        for attr, field in fields.items():
+            if errors.full:
+                return
+            value = raw_values.get(keys[attr], field.default)
             if value is None and not field.required:
                 continue
+            errors.push(attr)
             try:
-                field.validate_dict(attr, value)
+                field.collect_errors(attr, value, errors)
             except DataValidationError as e:
-                raise DataValidationError(f'{attr}.{e.path}', e.err)
+                errors.add(e.path, e.err)
             except AssertionError as e:
-                if len(e.args) > 0:
-                    raise DataValidationError(attr, f'Pre check failed: {str(e)}')
-                raise DataValidationError(attr, f'Pre check failed: Invalid value {value} for field {attr}')
+                errors.add(None, _pre_check_error(attr, value, e).err)
+            finally:
+                errors.pop()
 
-    def __validate(self):
-        for attr, field in self.get_fields().items():
+    def __validate(self, raw_values: dict = None):
+        _, fields, keys, _ = self.__get_fields_cache()
+        for attr, field in fields.items():
+            if raw_values is not None and raw_values.get(keys[attr]) is not None and _decode_validates(field):
+                continue  # already checked by Field.decode
             value = self.__getattribute__(attr)
             if value is None and not field.required:
                 continue
             try:
                 field.validate(attr, value)
             except DataValidationError as e:
-                raise DataValidationError(f'{attr}.{e.path}', e.err)
+                raise DataValidationError(_join_path(attr, e.path), e.err)
             except AssertionError:
-                raise DataValidationError(attr,
-                                          'Post check failed. Invalid value "{}" for field "{}"'.format(value, attr))
+                raise _post_check_error(attr, value)
 
     def __set_defaults(self):
-        for attr, field in self.get_fields().items():
+        _, fields, _, lazy = self.__get_fields_cache()
+        pending = self._lazy_raw if lazy else ()
+        for attr, field in fields.items():
             if field.required and field.default is not None:
                 raise InvalidSchema(f'Both required and default passed for field {attr}')
+            if attr in pending:
+                continue
             value = self.__getattribute__(attr)
             if value is None:
                 if field.default is not None:
@@ -179,30 +753,346 @@ class DictAble(_BaseDictAble):
                     self.__setattr__(attr, func(*args, **kwargs))
 
     def to_dict(self, skip_optional: bool = False) -> dict:
+        if self._compiled:
+            codecs = self.__get_codecs()
+            if codecs is not None:
+                return codecs[1](self, skip_optional)
         d = {}
-        for attr, field in self.__class__.get_fields().items():
+        _, fields, keys, lazy = self.__get_fields_cache()
+        pending = self._lazy_raw if lazy else ()
+        for attr, field in fields.items():
+            if attr in pending and attr not in self.__dict__ and _round_trips(field, pending[attr], skip_optional):
+                d[keys[attr]] = pending[attr]  # never read nor set, given back as received
+                continue
             raw_value = self.__getattribute__(attr)
             if not field.required and raw_value is None:
                 if skip_optional is False:
-                    d[self.get_field_key(attr)] = None
+                    d[keys[attr]] = None
                 continue
-            d[self.get_field_key(attr)] = field.to_dict(raw_value, skip_optional=skip_optional)
+            d[keys[attr]] = field.to_dict(raw_value, skip_optional=skip_optional)
         return d
 
+    @classmethod
+    def __get_json_plan(cls) -> tuple:
+        # ([(attr, '"key":', field, whether to_dict passes the value through)], lazy field names)
+        cache = cls.__dict__.get('_DictAble__json_plan')
+        if cache is None or cache[0] != get_generation(cls):
+            generation = get_generation(cls)
+            _, fields, keys, lazy = cls.__get_fields_cache()
+            plan = [
+                (attr, encode_str(keys[attr]) + ':', field, isinstance(field, PLAIN_FIELD_TYPES))
+                for attr, field in fields.items()
+            ]
+            cache = (generation, plan, lazy)
+            type.__setattr__(cls, '_DictAble__json_plan', cache)
+        return cache[1], cache[2]
+
+    def _write_json(self, skip_optional: bool, out: list, dumps: Callable[[Any], str] = dumps):
+        if type(self).to_dict is not DictAble.to_dict:
+            out.append(dumps(self.to_dict(skip_optional)))  # the class writes its own dict
+            return
+        plan, lazy = self.__get_json_plan()
+        pending = self._lazy_raw if lazy else ()
+        sep = '{'
+        for attr, key, field, plain in plan:
+            if attr in pending and attr not in self.__dict__ and _round_trips(field, pending[attr], skip_optional):
+                out.append(sep + key + dumps(pending[attr]))
+                sep = ','
+                continue
+            value = getattr(self, attr)
+            if value is None and not field.required:
+                if skip_optional is False:
+                    out.append(sep + key + 'null')
+                    sep = ','
+                continue
+            if plain:
+                out.append(sep + key + fragment(value, dumps))
+            else:
+                out.append(sep + key)
+                field.write_json(value, skip_optional, out, dumps)
+            sep = ','
+        out.append('{}' if sep == '{' else '}')
+
+    def to_json(self, skip_optional: bool = False, backend: str = None) -> str:
+        """
+        The same text as json.dumps(self.to_dict(skip_optional), separators=(',', ':'), ensure_ascii=False),
+        written from the fields without building the dict first. Lists and dicts are encoded by the JSON backend,
+        see get_json_backend.
+        """
+        out = []
+        self._write_json(skip_optional, out, get_json_backend(backend).dumps)
+        return ''.join(out)
+
+    def to_json_bytes(self, skip_optional: bool = False, backend: str = None) -> bytes:
+        """
+        to_json() encoded as UTF-8
+        """
+        return self.to_json(skip_optional, backend).encode()
+
     @classmethod
     def get_input_spec(cls) -> dict:
+        """
+        Cached until a Field is (re)assigned on this class or a class it refers to, each call returns a copy.
+        Raises RecursionError for models referring to themselves, see is_recursive().
+        """
+        cache = cls.__dict__.get('_DictAble__input_spec')
+        if cache is not None and cache[0] == cls._dependencies():
+            return _copy_spec(cache[1])
+        if cls.is_recursive():
+            raise RecursionError(f'{cls.__name__} refers to itself, use get_json_schema(new_schema=True) instead')
+        dependencies = cls._dependencies()
         d = {}
-        for attr, field in cls.get_fields().items():
-            d[cls.get_field_key(attr)] = field.spec()
-        return d
+        _, fields, keys, _ = cls.__get_fields_cache()
+        for attr, field in fields.items():
+            d[keys[attr]] = field.spec()
+        type.__setattr__(cls, '_DictAble__input_spec', (dependencies, d))
+        return _copy_spec(d)
+
+    @classmethod
+    def is_recursive(cls) -> bool:
+        """
+        Whether a class reachable from this one, itself included, refers back to itself through its fields
+        """
+        cache = cls.__dict__.get('_DictAble__recursive')
+        if cache is None or cache[0] != cls._dependencies():
+            cache = (cls._dependencies(), _has_cycle(cls))
+            type.__setattr__(cls, '_DictAble__recursive', cache)
+        return cache[1]
+
+    @classmethod
+    def _dependencies(cls) -> tuple:
+        """
+        The generations of the classes reachable from this one through its fields, itself first. Caches also derived
+        from the classes it refers to (specs, column plans) are valid as long as it is the same.
+        """
+        cache = cls.__dict__.get('_DictAble__dependencies')
+        if cache is None or get_generations(cache[0]) != cache[1]:
+            # a class found by a different walk has had its fields changed, so its generation differs from the one
+            # the last walk saw at its position
+            classes = _reachable(cls)
+            cache = (classes, get_generations(classes))
+            type.__setattr__(cls, '_DictAble__dependencies', cache)
+        return cache[1]
 
     def validate(self):
         pass
 
 
+def _copy_spec(spec):
+    # Specs and schemas only hold dicts, lists and scalars
+    if type(spec) is dict:
+        return {k: _copy_spec(v) for k, v in spec.items()}
+    if type(spec) is list:
+        return [_copy_spec(v) for v in spec]
+    return spec
+
+
+def _runs_hooks(klass: Type[_BaseDictAble]) -> bool:
+    # Whether building an instance runs code of the class: a validate() hook or an __init__ override
+    if not issubclass(klass, DictAble):
+        return True
+    return klass.validate is not DictAble.validate or klass.__init__ is not DictAble.__init__
+
+
+def _round_trips(field: Field, value, skip_optional: bool) -> bool:
+    """
+    Whether field.to_dict(field.from_trusted(value)) is value itself, for a validated value which is not None
+    """
+    field_type = type(field)
+    if field_type in PLAIN_FIELD_TYPES:
+        return True
+    if field_type is ObjectField:
+        return issubclass(field.obj_type, DictAble) and field.obj_type._round_trips(value, skip_optional)
+    if field_type is ListField:
+        obj_type = field.obj_type
+        return all(_round_trips(obj_type, e, skip_optional) for e in value)
+    return False
+
+
+def _field_refs(field: Field) -> List[Type[_BaseDictAble]]:
+    """
+    The classes a field spec refers to
+    """
+    if isinstance(field, ObjectField):
+        return [field.obj_type]
+    if isinstance(field, ListField):
+        return _field_refs(field.obj_type)
+    if isinstance(field, UnionField):
+        return [ref for child in field.fields for ref in _field_refs(child)]
+    if isinstance(field, DictField):
+        return _field_refs(field.key_type) + _field_refs(field.value_type)
+    if isinstance(field, MultiTypeField):
+        return list(field.index.values())
+    return []
+
+
+def _fill_columns(plan: list, objs: list, prefix: str, columns: Dict[str, list], arrays: bool):
+    for attr, key, field, children in plan:
+        values = [None if obj is None else getattr(obj, attr) for obj in objs]
+        if children is not None:
+            columns[prefix + key] = [v is not None for v in values]  # presence, read by _iter_rows
+            _fill_columns(children, values, f'{prefix}{key}.', columns, arrays)
+            continue
+        if not isinstance(field, PLAIN_FIELD_TYPES):
+            values = [None if v is None else field.to_dict(v) for v in values]
+        if arrays and type(field) in ARRAY_TYPES and None not in values:
+            try:
+                values = ArrayField(field).from_dict(values)
+            except OverflowError:
+                pass  # ints beyond 64 bits stay in a list
+        columns[prefix + key] = values
+
+
+def _iter_rows(plan: list, columns: Dict[str, list], prefix: str, nested: bool = False) -> Iterator[dict]:
+    """
+    Lazily zips the columns of a plan into row dicts, None when no column of the plan is given.
+    A nested object is None where its presence column, keyed by its own prefix, is false. Without one the nested
+    rows holding only None values are given as None.
+    """
+    keys, values = [], []
+    for _, key, field, children in plan:
+        name = prefix + key
+        if children is not None:
+            present = columns.get(name)
+            if present is None:
+                column = _iter_rows(children, columns, f'{name}.', nested=True)
+            else:
+                rows = _iter_rows(children, columns, f'{name}.')
+                rows = rows if rows is not None else ({} for _ in present)
+                column = (row if p else None for p, row in zip(present, rows))
+        else:
+            column = columns.get(name)
+            if column is not None and type(column) is not list and type(field) in ARRAY_TYPES:
+                column = ArrayField(field).to_dict(column)  # from to_columns(arrays=True)
+        if column is not None:
+            keys.append(key)
+            values.append(column)
+    if not keys:
+        return None
+    if nested:
+        width = len(keys)
+        return (None if row.count(None) == width else dict(zip(keys, row)) for row in zip(*values))
+    return (dict(zip(keys, row)) for row in zip(*values))
+
+
+class _Budget:
+    """
+    Counts the values walked by afrom_dict/avalidate_dict (list and dict elements, object fields), control goes
+    back to the event loop every `size`
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.left = size
+
+    async def spend(self, n: int = 1):
+        self.left -= n
+        if self.left <= 0:
+            self.left = self.size
+            await asyncio.sleep(0)
+
+
+def _shift_index(e: DataValidationError, offset: int) -> DataValidationError:
+    # '[3].lat' of a list chunk starting at offset
+    index, _, rest = e.path[1:].partition(']')
+    return DataValidationError(f'[{int(index) + offset}]{rest}', e.err)
+
+
+async def _awalk(field: Field, field_name: str, value, budget: _Budget, decode: bool):
+    """
+    field.decode(field_name, value), or field.validate_dict when not decode, giving control back to the event loop
+    while walking nested objects, lists and dicts
+    """
+    kind = type(field)
+    if kind is ObjectField and type(value) is dict and issubclass(field.obj_type, DictAble):
+        if decode:
+            return await field.obj_type._adecode(value, budget)
+        return await field.obj_type._avalidate(value, budget)
+    if kind is ListField and type(value) is list:
+        return await _awalk_list(field, field_name, value, budget, decode)
+    if kind in (DictField, DictValueField) and type(value) is dict and len(value) > budget.size:
+        items, decoded = list(value.items()), {}
+        for start in range(0, len(items), budget.size):
+            chunk = dict(items[start:start + budget.size])
+            if decode:
+                decoded.update(field.decode(field_name, chunk))
+            else:
+                field.validate_dict(field_name, chunk)
+            await budget.spend(len(chunk))
+        return decoded
+    if decode:
+        return field.decode(field_name, value)
+    field.validate_dict(field_name, value)
+
+
+async def _awalk_list(field: ListField, field_name: str, value: list, budget: _Budget, decode: bool) -> list:
+    obj_type, decoded = field.obj_type, []
+    if isinstance(obj_type, (ObjectField, ListField, DictField, DictValueField)):
+        # the elements may be large themselves, they are walked one by one
+        for i, e in enumerate(value):
+            try:
+                decoded.append(await _awalk(obj_type, field_name, e, budget, decode))
+            except AssertionError as ex:
+                raise DataValidationError(f'[{i}]', str(ex))
+            except DataValidationError as ex:
+                raise DataValidationError(_join_path(f'[{i}]', ex.path), ex.err)
+        return decoded
+    for start in range(0, len(value), budget.size):
+        chunk = value[start:start + budget.size]
+        try:
+            if decode:
+                decoded.extend(field.decode(field_name, chunk))
+            else:
+                field.validate_dict(field_name, chunk)
+        except DataValidationError as e:
+            raise _shift_index(e, start)
+        await budget.spend(len(chunk))
+    return decoded
+
+
+def _reachable(root: Type[_BaseDictAble]) -> List[Type[_BaseDictAble]]:
+    classes, seen = [root], {root}
+    for klass in classes:
+        get_fields = getattr(klass, 'get_fields', None)
+        for field in get_fields().values() if get_fields else ():
+            for ref in _field_refs(field):
+                if ref not in seen:
+                    seen.add(ref)
+                    classes.append(ref)
+    return classes
+
+
+def _has_cycle(root: Type[_BaseDictAble]) -> bool:
+    visiting, done = set(), set()
+
+    def visit(klass) -> bool:
+        if klass in done or not hasattr(klass, 'get_fields'):
+            return False
+        if klass in visiting:
+            return True
+        visiting.add(klass)
+        for field in klass.get_fields().values():
+            if any(visit(ref) for ref in _field_refs(field)):
+                return True
+        visiting.discard(klass)
+        done.add(klass)
+        return False
+
+    return visit(root)
+
+
 def partial(base_dictable: Type[DictAble]) -> Type[DictAble]:
     partial_attributes = {}
     for field_name, field_obj in base_dictable.get_fields().items():
         field_obj.required = False
         partial_attributes[field_name] = field_obj
-    return type(f'Partial{base_dictable.__name__}', (base_dictable,), partial_attributes)
+    # the shared Field objects changed, cached specs and codecs of the classes declaring them are stale
+    changed = set(map(id, partial_attributes.values()))
+    for klass in base_dictable.__mro__:
+        declared = list(vars(klass).values()) + list(klass.__dict__.get('_slot_fields', {}).values())
+        declared = [value.field if isinstance(value, _LazyAttribute) else value for value in declared]
+        if klass is base_dictable or any(id(value) in changed for value in declared):
+            invalidate_fields(klass)
+    partial_dictable = type(f'Partial{base_dictable.__name__}', (base_dictable,), partial_attributes)
+    register_dynamic_class(partial_dictable, partial, base_dictable)
+    return partial_dictable
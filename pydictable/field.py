@@ -1,11 +1,20 @@
 import math
 import re
 from abc import ABC
-from datetime import datetime
+from array import array
+from datetime import datetime, timedelta, timezone
 from enum import EnumMeta, Enum
-from typing import Type, List, Any
+from functools import lru_cache
+from math import floor
+from typing import Type, List, Any, Tuple, Dict, Pattern, Callable
 
-from pydictable.type import Field, _BaseDictAble, DefaultFactoryType
+from pydictable.json_codec import encode_str, dumps
+from pydictable.type import Field, _BaseDictAble, DefaultFactoryType, get_generations
+
+try:
+    import numpy
+except ImportError:  # optional, ArrayField falls back to array.array
+    numpy = None
 
 
 class DataValidationError(Exception):
@@ -15,6 +24,43 @@ class DataValidationError(Exception):
         self.err = err
 
 
+def _join_path(prefix: str, path: str) -> str:
+    # The error of a nested object's validate() hook has the path '.', it is reported on the object itself
+    return prefix if path == '.' else f'{prefix}.{path}'
+
+
+class ValidationErrors:
+    """
+    Collects (path, message) pairs while a payload is walked once, see DictAble.collect_errors.
+    Containers push a path segment (a name, or an int list index) before visiting a value and pop it after,
+    the path string is only joined when an error is recorded so valid data pays no formatting cost.
+    """
+
+    def __init__(self, max_errors: int = None):
+        self.errors: List[Tuple[str, str]] = []
+        self.max_errors = max_errors
+        self.full = max_errors is not None and max_errors <= 0
+        self._path = []
+
+    def push(self, segment):
+        self._path.append(segment)
+
+    def pop(self):
+        self._path.pop()
+
+    def add(self, path, message: str):
+        """
+        Records an error at the current path, `path` is a dotted suffix like DataValidationError.path or None
+        """
+        if self.full:
+            return
+        segments = [f'[{s}]' if type(s) is int else str(s) for s in self._path]
+        if path is not None and path != '.':
+            segments.append(str(path))
+        self.errors.append(('.'.join(segments) if segments else '.', message))
+        self.full = self.max_errors is not None and len(self.errors) >= self.max_errors
+
+
 class StrField(Field):
     def from_dict(self, v: str):
         return v
@@ -22,6 +68,9 @@ class StrField(Field):
     def to_dict(self, v, skip_optional: bool = False):
         return v
 
+    def write_json(self, v, skip_optional: bool, out: list, dumps: Callable[[Any], str] = dumps):
+        out.append('null' if v is None else encode_str(v))
+
     def validate_dict(self, field_name: str, v):
         assert type(v) == str
 
@@ -71,15 +120,105 @@ class FloatField(Field):
         assert type(v) == float
 
 
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+DATETIME_UNITS = {'s': 1000000, 'ms': 1000, 'us': 1}  # microseconds per unit
+# Below 2**33 seconds (year 2242) a float timestamp is within half a microsecond of any exact microsecond value,
+# so datetime.fromtimestamp rounds it back exactly. Larger values are converted with integer math.
+_FLOAT_EXACT_MICROS = (1 << 33) * 1000000
+
+
 class DatetimeField(Field):
-    def from_dict(self, v: int):
-        return datetime.fromtimestamp(v / 1000)
+    """
+    Epoch integers in `unit` ('s', 'ms' or 'us'), or ISO 8601 strings with unit='iso'. Integers are converted
+    exactly to naive local datetimes, or UTC aware ones with utc=True (naive datetimes are then encoded as UTC).
+    """
+
+    def __init__(self, *args, unit: str = 'ms', utc: bool = False, **kwargs):
+        super(DatetimeField, self).__init__(*args, **kwargs)
+        if unit != 'iso' and unit not in DATETIME_UNITS:
+            raise ValueError(f'Invalid unit {unit}, expected iso or one of {list(DATETIME_UNITS)}')
+        self.unit = unit
+        self.utc = utc
+        self._micros = DATETIME_UNITS.get(unit)
+        self._raw_type = str if unit == 'iso' else int
+        self._tz = timezone.utc if utc else None
+
+    def _to_utc(self, v: datetime) -> datetime:
+        return v.replace(tzinfo=timezone.utc) if v.tzinfo is None else v.astimezone(timezone.utc)
+
+    def _from_iso(self, v: str) -> datetime:
+        value = datetime.fromisoformat(v[:-1] + '+00:00' if v.endswith('Z') else v)
+        return self._to_utc(value) if self.utc else value
+
+    def _from_large(self, v: int) -> datetime:
+        micros = v * self._micros
+        if self.utc:
+            return EPOCH + timedelta(microseconds=micros)
+        seconds, microseconds = divmod(micros, 1000000)
+        return datetime.fromtimestamp(seconds).replace(microsecond=microseconds)
+
+    def from_dict(self, v):
+        if self._micros is None:
+            return self._from_iso(v)
+        if -_FLOAT_EXACT_MICROS < v * self._micros < _FLOAT_EXACT_MICROS:
+            return datetime.fromtimestamp(v * self._micros / 1000000, self._tz)
+        return self._from_large(v)
+
+    def from_list(self, values: list) -> list:
+        micros = self._micros
+        if micros is None:
+            return [self._from_iso(v) for v in values]
+        if values and -_FLOAT_EXACT_MICROS < min(values) * micros and max(values) * micros < _FLOAT_EXACT_MICROS:
+            fromtimestamp, tz, per_second = datetime.fromtimestamp, self._tz, 1000000 // micros
+            return [fromtimestamp(v / per_second, tz) for v in values]
+        return [self.from_dict(v) for v in values]
 
     def to_dict(self, v: datetime, skip_optional: bool = False):
-        return int(v.timestamp() * 1000)
+        if self.utc:
+            v = self._to_utc(v)
+        if self._micros is None:
+            return v.isoformat()
+        # The whole seconds of a float timestamp are exact, the microseconds are taken from the datetime
+        return floor(v.timestamp()) * (1000000 // self._micros) + v.microsecond // self._micros
+
+    def to_list(self, values: list) -> list:
+        if self.utc or self._micros is None:
+            return [self.to_dict(v) for v in values]
+        micros = self._micros
+        per_second = 1000000 // micros
+        return [floor(v.timestamp()) * per_second + v.microsecond // micros for v in values]
 
     def validate_dict(self, field_name: str, v):
-        assert type(v) == int
+        if self._micros is None:
+            self.decode(field_name, v)
+        else:
+            assert type(v) == int
+
+    def decode(self, field_name: str, v):
+        assert type(v) is self._raw_type
+        try:
+            return self.from_dict(v)
+        except (ValueError, OverflowError, OSError):
+            raise AssertionError(f'Invalid datetime {v}')
+
+    def decode_list(self, values: list) -> list:
+        """
+        Validates and converts a whole list in one loop, raising DataValidationError('[i]', ...) like ListField does
+        """
+        raw_type = self._raw_type
+        for i, v in enumerate(values):
+            if type(v) is not raw_type:
+                raise DataValidationError(f'[{i}]', '')
+        try:
+            return self.from_list(values)
+        except (ValueError, OverflowError, OSError):
+            pass
+        for i, v in enumerate(values):  # finds the culprit, the fast path does not track it
+            try:
+                self.decode('', v)
+            except AssertionError as e:
+                raise DataValidationError(f'[{i}]', str(e))
+        return self.from_list(values)
 
     def validate(self, field_name: str, v):
         assert isinstance(v, datetime)
@@ -96,11 +235,30 @@ class ObjectField(Field):
     def to_dict(self, v, skip_optional: bool = False):
         return None if v is None else v.to_dict(skip_optional)
 
+    def write_json(self, v, skip_optional: bool, out: list, dumps: Callable[[Any], str] = dumps):
+        if v is None:
+            out.append('null')
+        else:
+            v._write_json(skip_optional, out, dumps)
+
     def validate_dict(self, field_name: str, v):
         assert not self.required or v is not None
         assert type(v) == dict
         self.obj_type.validate_dict(v)
 
+    def collect_errors(self, field_name: str, v, errors: ValidationErrors):
+        assert not self.required or v is not None
+        assert type(v) == dict
+        self.obj_type._collect_errors(v, errors)
+
+    def decode(self, field_name: str, v):
+        assert not self.required or v is not None
+        assert type(v) == dict
+        return self.obj_type._decode(v)
+
+    def from_trusted(self, v):
+        return self.obj_type.from_trusted(v)
+
     def validate(self, field_name: str, v):
         assert isinstance(v, _BaseDictAble)
 
@@ -117,8 +275,27 @@ class ListField(Field):
         return [self.obj_type.from_dict(e) for e in v]
 
     def to_dict(self, v, skip_optional: bool = False):
+        if type(self.obj_type) is DatetimeField:
+            return self.obj_type.to_list(v)
         return [self.obj_type.to_dict(e, skip_optional) for e in v]
 
+    def write_json(self, v, skip_optional: bool, out: list, dumps: Callable[[Any], str] = dumps):
+        obj_type = self.obj_type
+        if type(obj_type) is not ObjectField or v is None:
+            return super(ListField, self).write_json(v, skip_optional, out, dumps)  # one encoder call for the list
+        out.append('[')
+        for i, e in enumerate(v):
+            if i:
+                out.append(',')
+            obj_type.write_json(e, skip_optional, out, dumps)
+        out.append(']')
+
+    def from_trusted(self, v):
+        obj_type = self.obj_type
+        if type(obj_type) is DatetimeField:
+            return obj_type.from_list(v)
+        return [obj_type.from_trusted(e) for e in v]
+
     def validate_dict(self, field_name: str, v):
         assert type(v) == list
         for i, _val in enumerate(v):
@@ -126,6 +303,39 @@ class ListField(Field):
                 self.obj_type.validate_dict(field_name, _val)
             except AssertionError as e:
                 raise DataValidationError(f'[{i}]', str(e))
+            except DataValidationError as e:
+                raise DataValidationError(_join_path(f'[{i}]', e.path), e.err)
+
+    def collect_errors(self, field_name: str, v, errors: ValidationErrors):
+        assert type(v) == list
+        obj_type = self.obj_type
+        for i, _val in enumerate(v):
+            if errors.full:
+                return
+            errors.push(i)
+            try:
+                obj_type.collect_errors(field_name, _val, errors)
+            except AssertionError as e:
+                errors.add(None, str(e) or f'Invalid value {_val}')
+            except DataValidationError as e:
+                errors.add(e.path, e.err)
+            finally:
+                errors.pop()
+
+    def decode(self, field_name: str, v):
+        assert type(v) == list
+        obj_type = self.obj_type
+        if type(obj_type) is DatetimeField:
+            return obj_type.decode_list(v)
+        values = []
+        for i, _val in enumerate(v):
+            try:
+                values.append(obj_type.decode(field_name, _val))
+            except AssertionError as e:
+                raise DataValidationError(f'[{i}]', str(e))
+            except DataValidationError as e:
+                raise DataValidationError(_join_path(f'[{i}]', e.path), e.err)
+        return values
 
     def validate(self, field_name: str, v):
         assert type(v) == list
@@ -135,6 +345,91 @@ class ListField(Field):
         return self.obj_type.spec()
 
 
+# Python type, array.array typecode and NumPy dtype of the values ArrayField holds per element field
+ARRAY_TYPES = {
+    IntField: (int, 'q', 'int64'),
+    FloatField: (float, 'd', 'float64'),
+    BoolField: (bool, 'b', 'bool'),
+}
+
+
+class ArrayField(ListField):
+    """
+    A list of ints, floats or bools which is type checked in bulk and stored as a NumPy array when NumPy is
+    installed, or as an array.array (bools as 0/1 bytes) otherwise or with use_numpy=False. Ints must fit in
+    64 bits. to_dict gives a plain list back, a plain list passed as a kwarg is kept as it is.
+    """
+
+    def __init__(self, obj_type: Field, *args, use_numpy: bool = None, **kwargs):
+        super(ArrayField, self).__init__(obj_type, *args, **kwargs)
+        if type(obj_type) not in ARRAY_TYPES:
+            raise TypeError(f'ArrayField holds IntField, FloatField or BoolField values, not {type(obj_type).__name__}')
+        if use_numpy and numpy is None:
+            raise ImportError('use_numpy=True needs NumPy installed')
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+        item_type, self._typecode, dtype = ARRAY_TYPES[type(obj_type)]
+        self._item_types = {item_type}
+        self._dtype = numpy.dtype(dtype) if numpy is not None else None
+
+    def from_dict(self, v):
+        if self.use_numpy:
+            return numpy.array(v, dtype=self._dtype)
+        return array(self._typecode, v)
+
+    def from_trusted(self, v):
+        return self.from_dict(v)
+
+    def to_dict(self, v, skip_optional: bool = False):
+        if type(v) is list:
+            return list(v)
+        if type(v) is array and v.typecode == 'b':
+            return list(map(bool, v))
+        return v.tolist()
+
+    def _check_types(self, field_name: str, v):
+        assert type(v) == list
+        if not set(map(type, v)) <= self._item_types:
+            super(ArrayField, self).validate_dict(field_name, v)  # reports the first bad element
+
+    @staticmethod
+    def _check_range(v):
+        if v and (min(v) < -(1 << 63) or max(v) >= 1 << 63):
+            for i, e in enumerate(v):
+                if not -(1 << 63) <= e < (1 << 63):
+                    raise DataValidationError(f'[{i}]', f'{e} does not fit in 64 bits')
+
+    def _build(self, v):
+        try:
+            return self.from_dict(v)
+        except OverflowError:
+            self._check_range(v)
+            raise
+
+    def validate_dict(self, field_name: str, v):
+        self._check_types(field_name, v)
+        if self._typecode == 'q':
+            self._check_range(v)
+
+    def collect_errors(self, field_name: str, v, errors: ValidationErrors):
+        assert type(v) == list
+        if not set(map(type, v)) <= self._item_types:
+            return super(ArrayField, self).collect_errors(field_name, v, errors)
+        if self._typecode == 'q':
+            self._check_range(v)
+
+    def decode(self, field_name: str, v):
+        self._check_types(field_name, v)
+        return self._build(v)
+
+    def validate(self, field_name: str, v):
+        if type(v) is list:
+            super(ArrayField, self).validate(field_name, v)
+        elif numpy is not None and isinstance(v, numpy.ndarray):
+            assert v.ndim == 1 and v.dtype == self._dtype
+        else:
+            assert type(v) is array and v.typecode == self._typecode
+
+
 class CustomField(Field, ABC):
     """
     For advance usage
@@ -153,22 +448,58 @@ class CustomField(Field, ABC):
 
 
 class MultiTypeField(CustomField):
+    """
+    Tagged union of DictAble classes, the tag (`type_key`, __type by default) holds the class name or one of
+    the `aliases` given as {alias: class}. Objects are encoded with their class name.
+    """
     TYPE_KEY = '__type'
 
-    def __init__(self, types: List[Type[_BaseDictAble]], *args, **kwargs):
+    def __init__(self, types: List[Type[_BaseDictAble]], *args, type_key: str = None,
+                 aliases: Dict[str, Type[_BaseDictAble]] = None, **kwargs):
+        self.type_key = type_key or self.TYPE_KEY
         self.types_dict = {t.__name__: t for t in types}
-        super(MultiTypeField, self).__init__(
-            lambda d: self.types_dict[d[self.TYPE_KEY]](dict=d),
-            lambda o: {**o.to_dict(), self.TYPE_KEY: o.__class__.__name__},
-            *args, **kwargs
-        )
+        self.index = {**self.types_dict, **(aliases or {})}  # every accepted tag -> class
+        self._names = {t: name for name, t in self.types_dict.items()}
+        super(MultiTypeField, self).__init__(self.from_dict, self.to_dict, *args, **kwargs)
+
+    def _get_type(self, v) -> Type[_BaseDictAble]:
+        assert type(v) is dict
+        type_name = v.get(self.type_key)
+        obj_type = self.index.get(type_name) if type(type_name) is str else None
+        assert obj_type is not None, f'Invalid {self.type_key} {type_name}, expected one of {list(self.index)}'
+        return obj_type
+
+    def from_dict(self, v):
+        return self._get_type(v)(dict=v)
+
+    def to_dict(self, v, skip_optional: bool = False):
+        d = v.to_dict(skip_optional)  # a new dict, the tag is added in place
+        d[self.type_key] = self._names.get(type(v)) or type(v).__name__
+        return d
 
     def validate_dict(self, field_name: str, v):
-        self.types_dict[v[self.TYPE_KEY]](dict=v)
+        self._get_type(v).validate_dict(v)
+
+    def collect_errors(self, field_name: str, v, errors: ValidationErrors):
+        self._get_type(v)._collect_errors(v, errors)
+
+    def decode(self, field_name: str, v):
+        return self._get_type(v)._decode(v)
+
+    def from_trusted(self, v):
+        return self.index[v[self.type_key]].from_trusted(v)
 
     def validate(self, field_name: str, v):
         pass
 
+    def spec(self) -> dict:
+        spec = super(MultiTypeField, self).spec()
+        spec['tag'] = self.type_key
+        return spec
+
+    def of(self):
+        return {name: obj_type.get_input_spec() for name, obj_type in self.index.items()}
+
 
 class EnumField(Field):
     def __init__(self, enum: EnumMeta, is_name: bool = False, *args, **kwargs):
@@ -183,8 +514,11 @@ class EnumField(Field):
         return v.value
 
     def validate_dict(self, field_name: str, v):
+        self.decode(field_name, v)
+
+    def decode(self, field_name: str, v):
         try:
-            self.enum[v] if self.is_name else self.enum(v)
+            return self.enum[v] if self.is_name else self.enum(v)
         except ValueError as e:
             raise AssertionError('Invalid enum')
         except KeyError as e:
@@ -214,7 +548,39 @@ class DictValueField(Field):
 
     def validate_dict(self, field_name: str, v: dict):
         assert type(v) == dict
-        [self.value_type(dict=v) for v in v.values()]
+        value_type = self.value_type
+        for val in v.values():
+            assert type(val) is dict
+            value_type.validate_dict(val)
+
+    def collect_errors(self, field_name: str, v: dict, errors: ValidationErrors):
+        assert type(v) == dict
+        value_type = self.value_type
+        for key, val in v.items():
+            if errors.full:
+                return
+            errors.push(key if type(key) is str else str(key))
+            try:
+                if type(val) is not dict:
+                    errors.add(None, f'Invalid value {val}, expected a dict')
+                else:
+                    value_type._collect_errors(val, errors)
+            except DataValidationError as e:
+                errors.add(e.path, e.err)
+            finally:
+                errors.pop()
+
+    def decode(self, field_name: str, v):
+        assert type(v) == dict
+        value_type = self.value_type
+        decoded = {}
+        for key, val in v.items():
+            assert type(val) is dict
+            decoded[key] = value_type._decode(val)
+        return decoded
+
+    def from_trusted(self, v):
+        return {key: self.value_type.from_trusted(val) for key, val in v.items()}
 
     def validate(self, field_name: str, v):
         assert type(v) == dict
@@ -223,21 +589,110 @@ class DictValueField(Field):
 
 
 class UnionField(Field):
-    def __init__(self, fields: List[Field], *args, **kwargs):
+    """
+    Tries its fields in order. Branches are first narrowed down by the type of the value, so only the fields
+    which may accept it are tried. With a `discriminator` key, a dict whose discriminator value names an object
+    branch goes straight to it: the value of the object class' field with that key and a default, or the class name.
+    """
+
+    def __init__(self, fields: List[Field], *args, discriminator: str = None, **kwargs):
         super(UnionField, self).__init__(*args, **kwargs)
         self.fields = fields
+        self.discriminator = discriminator
+        self._raw_branches = {}  # type of a raw value -> fields that may accept it
+        self._value_branches = {}  # same for values of the object
+        self._tags = None  # (generations of the object classes, discriminator value -> field)
+
+    def _branches_for_type(self, value_type: type, raw: bool) -> tuple:
+        types_map = _RAW_TYPES if raw else _VALUE_TYPES
+        branches = []
+        has_object = False
+        for field in self.fields:
+            if type(field) is ObjectField and not raw:
+                if has_object:
+                    continue  # every object branch checks and encodes an object the same way
+                has_object = True
+            if type(field) is EnumField and not raw:
+                types = (field.enum,)
+            elif type(field) is DatetimeField and raw:
+                types = (field._raw_type,)
+            else:
+                types = types_map.get(type(field))
+            if types is None or issubclass(value_type, types):
+                branches.append(field)
+        return tuple(branches)
+
+    def _get_tags(self) -> dict:
+        objects = [field for field in self.fields if type(field) is ObjectField]
+        generations = get_generations([field.obj_type for field in objects])
+        if self._tags is None or self._tags[0] != generations:
+            tags = {}
+            for field in objects:
+                tags.setdefault(self._tag_of(field.obj_type), field)
+            self._tags = (generations, tags)
+        return self._tags[1]
+
+    def _tag_of(self, obj_type: Type[_BaseDictAble]):
+        get_fields = getattr(obj_type, 'get_fields', None)
+        for attr, field in (get_fields() if get_fields else {}).items():
+            if (field.key or attr) == self.discriminator and field.default is not None:
+                return field.default
+        return obj_type.__name__
+
+    def _raw_candidates(self, v) -> tuple:
+        value_type = type(v)
+        branches = self._raw_branches.get(value_type)
+        if branches is None:
+            branches = self._raw_branches[value_type] = self._branches_for_type(value_type, True)
+        if self.discriminator is not None and value_type is dict and len(branches) > 1:
+            tag = v.get(self.discriminator)
+            if type(tag) in (str, int):
+                field = self._get_tags().get(tag)
+                if field is not None:
+                    return field,
+        return branches
+
+    def _value_candidates(self, v) -> tuple:
+        value_type = type(v)
+        branches = self._value_branches.get(value_type)
+        if branches is None:
+            branches = self._value_branches[value_type] = self._branches_for_type(value_type, False)
+        return branches
+
+    def _no_match(self, v) -> AssertionError:
+        return AssertionError(f'{v} does not match for any of {[f.__class__.__name__ for f in self.fields]}')
 
     def from_dict(self, v):
-        for field in self.fields:
+        for field in self._raw_candidates(v):
             try:
-                field.validate_dict('', v)
-                return field.from_dict(v)
+                return field.decode('', v)
             except (AssertionError, DataValidationError):
                 pass
         raise NotImplementedError()
 
+    def decode(self, field_name: str, v):
+        for field in self._raw_candidates(v):
+            try:
+                return field.decode('', v)
+            except (AssertionError, DataValidationError):
+                pass
+        raise self._no_match(v)
+
+    def from_trusted(self, v):
+        # The value is valid, the matching branch only has to be searched when several may accept it
+        candidates = self._raw_candidates(v)
+        if len(candidates) == 1:
+            return candidates[0].from_trusted(v)
+        for field in candidates:
+            try:
+                field.validate_dict('', v)
+            except (AssertionError, DataValidationError):
+                continue
+            return field.from_trusted(v)
+        raise NotImplementedError()
+
     def to_dict(self, v, skip_optional: bool = False):
-        for field in self.fields:
+        for field in self._value_candidates(v):
             try:
                 field.validate('', v)
                 return field.to_dict(v, skip_optional)
@@ -246,22 +701,22 @@ class UnionField(Field):
         raise NotImplementedError()
 
     def validate_dict(self, field_name: str, v):
-        for field in self.fields:
+        for field in self._raw_candidates(v):
             try:
                 field.validate_dict('', v)
                 return
             except (AssertionError, DataValidationError):
                 pass
-        raise AssertionError(f'{v} does not match for any of {[f.__class__.__name__ for f in self.fields]}')
+        raise self._no_match(v)
 
     def validate(self, field_name: str, v):
-        for field in self.fields:
+        for field in self._value_candidates(v):
             try:
                 field.validate('', v)
                 return
             except AssertionError:
                 pass
-        raise AssertionError(f'{v} does not match for any of {[f.__class__.__name__ for f in self.fields]}')
+        raise self._no_match(v)
 
     def of(self):
         return [f.spec() for f in self.fields]
@@ -312,6 +767,10 @@ class DictField(Field):
     def from_dict(self, value):
         return {self.key_type.from_dict(k): self.value_type.from_dict(v) for k, v in value.items()}
 
+    def from_trusted(self, value):
+        key_type, value_type = self.key_type, self.value_type
+        return {key_type.from_trusted(k): value_type.from_trusted(v) for k, v in value.items()}
+
     def to_dict(self, value, skip_optional: bool = False):
         return {self.key_type.to_dict(k, skip_optional): self.value_type.to_dict(v, skip_optional)
                 for k, v in value.items()}
@@ -333,6 +792,51 @@ class DictField(Field):
             except DataValidationError as e:
                 raise DataValidationError(f'{k}.{e.path}', f'Invalid value, {str(e.err)}')
 
+    def collect_errors(self, field_name: str, value, errors: ValidationErrors):
+        assert type(value) is dict
+        key_type, value_type = self.key_type, self.value_type
+        for k, v in value.items():
+            if errors.full:
+                return
+            errors.push(k if type(k) is str else str(k))  # an int would read as a list index
+            try:
+                try:
+                    key_type.validate_dict(None, k)
+                except AssertionError as e:
+                    errors.add(None, f'Invalid key, {str(e) or k}')
+                    continue
+                except DataValidationError as e:
+                    errors.add(e.path, f'Invalid key, {str(e.err)}')
+                    continue
+                try:
+                    value_type.collect_errors(None, v, errors)
+                except AssertionError as e:
+                    errors.add(None, f'Invalid value, {str(e) or v}')
+                except DataValidationError as e:
+                    errors.add(e.path, f'Invalid value, {str(e.err)}')
+            finally:
+                errors.pop()
+
+    def decode(self, field_name: str, value):
+        assert type(value) is dict
+        key_type, value_type = self.key_type, self.value_type
+        decoded = {}
+        for k, v in value.items():
+            try:
+                _k = key_type.decode(None, k)
+            except AssertionError as e:
+                raise DataValidationError(k, f'Invalid key, {str(e)}')
+            except DataValidationError as e:
+                raise DataValidationError(_join_path(f'{k}', e.path), f'Invalid key, {str(e.err)}')
+
+            try:
+                decoded[_k] = value_type.decode(None, v)
+            except AssertionError:
+                raise DataValidationError(k, 'Invalid value')
+            except DataValidationError as e:
+                raise DataValidationError(_join_path(f'{k}', e.path), f'Invalid value, {str(e.err)}')
+        return decoded
+
     def validate(self, field_name: str, value):
         assert type(value) is dict
         for k, v in value.items():
@@ -346,10 +850,26 @@ class DictField(Field):
         }   
          
 
+PATTERN_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_pattern(regex_string: str, flags: int = 0) -> Pattern:
+    """
+    Compiled patterns shared by every RegexField, bounded so fields made at runtime (e.g. by GenericDictAble.inject)
+    can not grow it forever
+    """
+    return re.compile(regex_string, flags)
+
+
 class RegexField(Field):
-    def __init__(self, regex_string: str, *args, **kwargs):
+    def __init__(self, regex_string: str, *args, fullmatch: bool = False, flags: int = 0, **kwargs):
         super(RegexField, self).__init__(*args, **kwargs)
         self.regex_string = regex_string
+        self.fullmatch = fullmatch
+        self.flags = flags
+        pattern = compile_pattern(regex_string, flags)
+        self._match = pattern.fullmatch if fullmatch else pattern.match
 
     def from_dict(self, v):
         return v
@@ -359,13 +879,18 @@ class RegexField(Field):
 
     def validate_dict(self, field_name: str, v):
         assert isinstance(v, str)
-        assert re.match(self.regex_string, v), f"{v} for {field_name} should be in proper format"
+        assert self._match(v), f"{v} for {field_name} should be in proper format"
 
     def validate(self, field_name: str, v):
         assert isinstance(v, str)
 
     def of(self):
-        return {'regex': self.regex_string}
+        of = {'regex': self.regex_string}
+        if self.fullmatch:
+            of['fullmatch'] = True
+        if self.flags:
+            of['flags'] = int(self.flags)
+        return of
 
 
 class RangeIntField(Field):
@@ -414,3 +939,38 @@ class RangeFloatField(Field):
 
     def of(self):
         return {'min': self.min_val, 'max': self.max_val}
+
+
+# Types of the raw and the converted values each built-in field may accept, a UnionField only tries the fields
+# matching the type of the value. Subclasses and fields missing here may accept anything.
+_RAW_TYPES = {
+    StrField: (str,),
+    IntField: (int,),
+    FloatField: (float,),
+    BoolField: (bool,),
+    NoneField: (type(None),),
+    ObjectField: (dict,),
+    ListField: (list,),
+    DictField: (dict,),
+    DictValueField: (dict,),
+    MultiTypeField: (dict,),
+    EnumField: None,
+    RegexField: (str,),
+    RangeIntField: (int,),
+    RangeFloatField: (float,),
+}
+_VALUE_TYPES = {
+    StrField: (str,),
+    IntField: (int,),
+    FloatField: (float,),
+    BoolField: (bool,),
+    DatetimeField: (datetime,),
+    NoneField: (type(None),),
+    ObjectField: (_BaseDictAble,),
+    ListField: (list,),
+    DictField: (dict,),
+    DictValueField: (dict,),
+    RegexField: (str,),
+    RangeIntField: (int,),
+    RangeFloatField: (float,),
+}
@@ -2,9 +2,12 @@ import inspect
 from typing import Dict
 
 from pydictable import Field, DictAble
+from pydictable.type import register_dynamic_class
 
 
 class GenericDictAble(DictAble):
+    __slots__ = ()
+
     @classmethod
     def clone(cls):
         class _DictAble(DictAble):
@@ -14,8 +17,12 @@ class GenericDictAble(DictAble):
         for attr in inspect.getmembers(cls):
             if isinstance(attr[1], Field):
                 fields[attr[0]] = attr[1]
+        for klass in cls.__mro__:
+            # compact classes keep their Field objects aside, the class attribute is the slot
+            for name, field in klass.__dict__.get('_slot_fields', {}).items():
+                fields.setdefault(name, field)
 
-        for key, value in fields.items():
+        for key, value in sorted(fields.items()):
             setattr(_DictAble, key, value)
 
         return _DictAble
@@ -29,4 +36,5 @@ class GenericDictAble(DictAble):
         new = cls.clone()
         for key, field in cls.inject(*args, **kwargs).items():
             setattr(new, key, field)
+        register_dynamic_class(new, cls.make, *args, **kwargs)
         return new
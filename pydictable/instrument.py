@@ -0,0 +1,155 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, Iterator
+
+from pydictable.core import DictAble
+from pydictable.field import DataValidationError
+
+# Timed phases, times include the nested objects built or checked on the way
+PHASES = ('construct', 'from_dict', 'validate', 'hook', 'validate_dict', 'to_dict')
+
+
+class Stats:
+    """
+    Per class counters gathered while instrumentation is enabled, see to_dict() for the exported shape
+    """
+
+    def __init__(self):
+        self._classes: Dict[type, dict] = {}
+
+    def _get(self, cls: type) -> dict:
+        stats = self._classes.get(cls)
+        if stats is None:
+            stats = self._classes[cls] = {'construct': 0, 'time': dict.fromkeys(PHASES, 0.0), 'failures': {}}
+        return stats
+
+    def _failed(self, cls: type, e: DataValidationError):
+        failures = self._get(cls)['failures']
+        attr = str(e.path).split('.', 1)[0] or '.'  # '.' is the validate() hook
+        failures[attr] = failures.get(attr, 0) + 1
+
+    def to_dict(self) -> dict:
+        """
+        {'Module.Class': {'construct': count, 'time': {phase: seconds}, 'failures': {field: count}}}
+        """
+        return {
+            f'{cls.__module__}.{cls.__qualname__}': {
+                'construct': stats['construct'],
+                'time': dict(stats['time']),
+                'failures': dict(stats['failures'])
+            }
+            for cls, stats in self._classes.items()
+        }
+
+
+_active: Stats = None
+_originals: dict = {}
+
+
+def _timed_construct(stats: Stats, func, phase: str):
+    def wrapper(cls_or_self, *args, **kwargs):
+        cls = cls_or_self if isinstance(cls_or_self, type) else type(cls_or_self)
+        start = perf_counter()
+        try:
+            return func(cls_or_self, *args, **kwargs)
+        except DataValidationError as e:
+            stats._failed(cls, e)
+            raise
+        finally:
+            class_stats = stats._get(cls)
+            class_stats['time'][phase] += perf_counter() - start
+            if phase == 'construct':
+                class_stats['construct'] += 1
+
+    return wrapper
+
+
+def _timed(stats: Stats, func, phase: str):
+    def wrapper(self, *args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            stats._get(type(self))['time'][phase] += perf_counter() - start
+
+    return wrapper
+
+
+def _instrumented_finish(stats: Stats):
+    # Same steps as DictAble.__finish, timing the post check and the validate() hook apart
+    def finish(self, raw_values: dict = None):
+        class_stats = stats._get(type(self))
+        self._DictAble__set_defaults()
+        start = perf_counter()
+        self._DictAble__validate(raw_values)
+        hook_start = perf_counter()
+        class_stats['time']['validate'] += hook_start - start
+        try:
+            self.validate()
+        except AssertionError as e:
+            raise DataValidationError('.', f'Validation failed with error: {str(e)}')
+        finally:
+            class_stats['time']['hook'] += perf_counter() - hook_start
+
+    return finish
+
+
+def _no_codecs(cls):
+    # The generated decoders of compiled classes run every phase inline, the interpreted path is timed instead
+    return None
+
+
+def enable(stats: Stats = None) -> Stats:
+    """
+    Starts recording into stats (a new Stats by default) and returns it. The DictAble methods are swapped with
+    timed ones until disable(), so nothing is paid while instrumentation is off. Meanwhile compiled classes
+    (compiled=True) are decoded and encoded like the other ones, their generated code is not used.
+    """
+    global _active
+    if _active is not None:
+        raise RuntimeError('Instrumentation is already enabled')
+    _active = stats = stats or Stats()
+    namespace = DictAble.__dict__
+    _originals.update({name: namespace[name] for name in (
+        '__init__', '_decode', 'from_trusted', 'validate_dict', 'to_dict', '_DictAble__apply_dict', '_DictAble__finish',
+        '_DictAble__get_codecs'
+    )})
+    patches = {
+        '__init__': _timed_construct(stats, _originals['__init__'], 'construct'),
+        '_decode': classmethod(_timed_construct(stats, _originals['_decode'].__func__, 'construct')),
+        'from_trusted': classmethod(_timed_construct(stats, _originals['from_trusted'].__func__, 'construct')),
+        'validate_dict': classmethod(_timed_construct(stats, _originals['validate_dict'].__func__, 'validate_dict')),
+        'to_dict': _timed(stats, _originals['to_dict'], 'to_dict'),
+        '_DictAble__apply_dict': _timed(stats, _originals['_DictAble__apply_dict'], 'from_dict'),
+        '_DictAble__finish': _instrumented_finish(stats),
+        '_DictAble__get_codecs': classmethod(_no_codecs),
+    }
+    for name, value in patches.items():
+        type.__setattr__(DictAble, name, value)
+    return stats
+
+
+def disable() -> Stats:
+    """
+    Puts the original DictAble methods back and returns the stats recorded so far
+    """
+    global _active
+    stats, _active = _active, None
+    for name, value in _originals.items():
+        type.__setattr__(DictAble, name, value)
+    _originals.clear()
+    return stats
+
+
+@contextmanager
+def instrument(stats: Stats = None) -> Iterator[Stats]:
+    """
+    with instrument() as stats:
+        ...
+    stats.to_dict()
+    """
+    stats = enable(stats)
+    try:
+        yield stats
+    finally:
+        disable()
@@ -0,0 +1,236 @@
+import json
+import re
+from json.decoder import JSONDecodeError, WHITESPACE, scanstring
+from json.encoder import encode_basestring
+from json.scanner import make_scanner
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # optional accelerator
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # optional accelerator
+    ujson = None
+
+# Output of DictAble.to_json, the same text as json.dumps(obj.to_dict(), separators=(',', ':'), ensure_ascii=False)
+_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+encode_str = encode_basestring
+
+
+def dumps(value: Any) -> str:
+    return _encoder.encode(value)
+
+
+def _float(v: float) -> str:
+    if v != v:
+        return 'NaN'
+    if v in (float('inf'), float('-inf')):
+        return 'Infinity' if v > 0 else '-Infinity'
+    return float.__repr__(v)
+
+
+_SCALARS = {
+    str: encode_basestring,
+    int: int.__repr__,
+    float: _float,
+    bool: lambda v: 'true' if v else 'false',
+    type(None): lambda v: 'null',
+}
+
+
+def fragment(value: Any, dumps: Callable[[Any], str] = dumps) -> str:
+    """
+    The JSON text of a value like dumps, scalars skip the encoder set up
+    """
+    scalar = _SCALARS.get(type(value))
+    return scalar(value) if scalar is not None else dumps(value)
+
+
+_scan_once = make_scanner(json.JSONDecoder())
+_skip_ws = WHITESPACE.match
+
+
+def skip_ws(s: str, idx: int) -> int:
+    return _skip_ws(s, idx).end()
+
+
+def scan_value(s: str, idx: int) -> Tuple[Any, int]:
+    """
+    Parses the JSON value starting at idx like json.loads would, returns it with the index right after it
+    """
+    try:
+        return _scan_once(s, idx)
+    except StopIteration as e:
+        raise JSONDecodeError('Expecting value', s, e.value) from None
+
+
+def iter_object(s: str, idx: int) -> Iterator[Tuple[str, Any, int, int]]:
+    """
+    Parses the JSON object starting at idx member by member, yields (key, value, value start, value end).
+    The caller can stop early, nothing after the last yielded member is read then.
+    """
+    end = skip_ws(s, idx + 1)
+    if s[end:end + 1] == '}':
+        return
+    while True:
+        if s[end:end + 1] != '"':
+            raise JSONDecodeError('Expecting property name enclosed in double quotes', s, end)
+        key, end = scanstring(s, end + 1)
+        end = skip_ws(s, end)
+        if s[end:end + 1] != ':':
+            raise JSONDecodeError("Expecting ':' delimiter", s, end)
+        start = skip_ws(s, end + 1)
+        value, end = scan_value(s, start)
+        yield key, value, start, end
+        end = skip_ws(s, end)
+        if s[end:end + 1] == '}':
+            return
+        if s[end:end + 1] != ',':
+            raise JSONDecodeError("Expecting ',' delimiter", s, end)
+        end = skip_ws(s, end + 1)
+
+
+def _child(s: str, idx: int, segment: Union[str, int]) -> int:
+    found = None
+    try:
+        if s[idx:idx + 1] == '{' and isinstance(segment, str):
+            for key, _, start, _ in iter_object(s, idx):
+                if key == segment:
+                    found = start  # the last one wins like in json.loads
+        elif s[idx:idx + 1] == '[' and isinstance(segment, int):
+            end = skip_ws(s, idx + 1)
+            for _ in range(segment + 1):
+                if s[end:end + 1] in (']', ''):
+                    return None
+                start = end
+                _, end = scan_value(s, start)
+                end = skip_ws(s, skip_ws(s, end) + 1)  # past the ','
+            found = start
+    except JSONDecodeError:
+        pass  # the document was rejected before its end, which may not be valid JSON
+    return found
+
+
+def locate(s: str, idx: int, segments: List[Union[str, int]]) -> int:
+    """
+    Follows object keys and array indexes from the JSON value at idx, returns the start of the deepest value found
+    """
+    for segment in segments:
+        found = _child(s, idx, segment)
+        if found is None:
+            break
+        idx = found
+    return idx
+
+
+def byte_offset(s: str, idx: int) -> int:
+    return len(s[:idx].encode('utf-8', 'surrogatepass'))
+
+
+class JsonBackend:
+    """
+    A JSON implementation used by to_json and from_json. dumps must give the same text as the stdlib one above
+    (compact separators, ensure_ascii=False) and loads the same values as json.loads.
+    """
+
+    def __init__(self, name: str, dumps: Callable[[Any], str], loads: Callable[[Union[str, bytes]], Any]):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+
+# Floats the stdlib writes with an exponent (below 1e-4 or from 1e16 on) an accelerator may write without one,
+# and the other way round ('1e16' for the stdlib's '1e+16')
+_EXPONENT = re.compile(rb'[0-9][eE]|0\.0000|[0-9]{17}\.')
+_NATIVE_TYPES = {str, int, float, bool, type(None), list, dict}
+
+
+def _scalar_types(value: Any, found: set) -> bool:
+    """
+    Adds the types of the scalars of a list or dict to found, False when it holds something else than JSON types:
+    accelerators also encode datetimes, enums, UUIDs or str subclasses, which the stdlib rejects or writes another way
+    """
+    values = value.values() if type(value) is dict else value
+    types = set(map(type, values))
+    if not types <= _NATIVE_TYPES:
+        return False
+    found |= types
+    if list in types or dict in types:
+        return all(_scalar_types(v, found) for v in values if type(v) is list or type(v) is dict)
+    return True
+
+
+def _accelerated(value: Any, encoded: Callable[[Any], bytes]) -> str:
+    # The text of an accelerator when the stdlib would write the same, its own text otherwise
+    found = set()
+    if type(value) not in (list, dict) or not _scalar_types(value, found):
+        return dumps(value)
+    try:
+        out = encoded(value)
+    except (OverflowError, TypeError, ValueError):  # NaN, Infinity, big ints, non str keys, lone surrogates...
+        return dumps(value)
+    if float in found and (b'null' in out or _EXPONENT.search(out)):  # orjson writes NaN and Infinity as null
+        return dumps(value)
+    return out.decode()
+
+
+def _orjson_dumps(value: Any) -> str:
+    return _accelerated(value, orjson.dumps)
+
+
+# 19 digits may not fit in 64 bits, orjson reads such ints as floats
+_LONG_INT = {str: re.compile('[0-9]{19}'), bytes: re.compile(rb'[0-9]{19}')}
+
+
+def _orjson_loads(data: Union[str, bytes]) -> Any:
+    if _LONG_INT[str if isinstance(data, str) else bytes].search(data):
+        return json.loads(data)
+    try:
+        return orjson.loads(data)
+    except ValueError:  # NaN, or invalid JSON for which json.loads raises its own error
+        return json.loads(data)
+
+
+def _ujson_dumps(value: Any) -> str:
+    return _accelerated(value, lambda v: ujson.dumps(v, ensure_ascii=False, escape_forward_slashes=False).encode())
+
+
+STDLIB_BACKEND = JsonBackend('json', dumps, json.loads)
+JSON_BACKENDS: Dict[str, JsonBackend] = {}
+_default_backend = STDLIB_BACKEND
+
+
+def register_json_backend(backend: JsonBackend, default: bool = False):
+    global _default_backend
+    JSON_BACKENDS[backend.name] = backend
+    if default:
+        _default_backend = backend
+
+
+def set_default_json_backend(name: str):
+    global _default_backend
+    _default_backend = get_json_backend(name)
+
+
+def get_json_backend(name: str = None) -> JsonBackend:
+    """
+    The backend registered with that name, or the default one: the first installed of orjson, ujson and json
+    """
+    if name is None:
+        return _default_backend
+    try:
+        return JSON_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f'Unknown JSON backend {name}, expected one of {list(JSON_BACKENDS)}') from None
+
+
+register_json_backend(STDLIB_BACKEND)
+if ujson is not None:
+    # ujson.loads may round floats differently, values are parsed with the stdlib
+    register_json_backend(JsonBackend('ujson', _ujson_dumps, json.loads), default=True)
+if orjson is not None:
+    register_json_backend(JsonBackend('orjson', _orjson_dumps, _orjson_loads), default=True)
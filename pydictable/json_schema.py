@@ -1,20 +1,33 @@
 from typing import Type, Tuple, List
 
-from pydictable import DictAble, Field, ListField, UnionField, DictField, ObjectField
+from pydictable import DictAble, Field, ListField, UnionField, DictField, ObjectField, MultiTypeField
+from pydictable.core import _copy_spec
+from pydictable.type import get_generation
+
+
+def _get_def(schema: Type[DictAble]) -> Tuple[dict, List[Type[DictAble]]]:
+    # (generation, its $defs entry, classes it refers to), kept on the class like the fields cache
+    cache = schema.__dict__.get('_json_schema_def')
+    if cache is None or cache[0] != get_generation(schema):
+        generation = get_generation(schema)
+        _spec, refs = {}, []
+        for attr, field in schema.get_fields().items():
+            field_schema, field_refs = _get_field_schema(field)
+            _spec[schema.get_field_key(attr)] = field_schema
+            refs += field_refs
+        cache = (generation, _spec, refs)
+        type.__setattr__(schema, '_json_schema_def', cache)
+    return cache[1], cache[2]
 
 
 def _update_spec(schema: Type[DictAble], spec: dict):
     if schema.__name__ in spec.get('$defs', {}):
         return
 
-    spec['$defs'][schema.__name__] = {}
-    _spec = spec['$defs'][schema.__name__]
-    for attr, field in schema.get_fields().items():
-        field_key = schema.get_field_key(attr)
-        field_schema, refs = _get_field_schema(field)
-        _spec[field_key] = field_schema
-        for ref in refs:
-            _update_spec(ref, spec)
+    _spec, refs = _get_def(schema)
+    spec['$defs'][schema.__name__] = _copy_spec(_spec)
+    for ref in refs:
+        _update_spec(ref, spec)
 
 
 def _get_field_schema(field: Field) -> Tuple[dict, List[Type[DictAble]]]:
@@ -41,6 +54,10 @@ def _get_field_schema(field: Field) -> Tuple[dict, List[Type[DictAble]]]:
         }
         refs += key_refs
         refs += value_refs
+    if isinstance(field, MultiTypeField):
+        schema['tag'] = field.type_key
+        schema['of'] = {name: {'$ref': f'#/$defs/{obj_type.__name__}'} for name, obj_type in field.index.items()}
+        refs += list(field.index.values())
     if isinstance(field, ObjectField):
         schema['of'] = {
             '$ref': f'#/$defs/{field.obj_type.__name__}'
@@ -50,14 +67,34 @@ def _get_field_schema(field: Field) -> Tuple[dict, List[Type[DictAble]]]:
 
 
 def get_json_schema(schema: Type[DictAble], new_schema: bool = False) -> dict:
-    try:
-        if not new_schema:
-            return schema.get_input_spec()
-    except RecursionError:
-        pass
+    """
+    The input spec of the class, or the $defs based schema with new_schema or when the class is recursive.
+    Results are cached until a Field is (re)assigned on the class or a class it refers to, each call returns a copy.
+    """
+    if not new_schema and not schema.is_recursive():
+        return schema.get_input_spec()
+    cache = schema.__dict__.get('_json_schema')
+    if cache is None or cache[0] != schema._dependencies():
+        dependencies = schema._dependencies()
+        spec = {
+            '$defs': {},
+            '$root': f'#/$defs/{schema.__name__}'
+        }
+        _update_spec(schema, spec)
+        cache = (dependencies, spec)
+        type.__setattr__(schema, '_json_schema', cache)
+    return _copy_spec(cache[1])
+
+
+def get_json_schemas(schemas: List[Type[DictAble]]) -> dict:
+    """
+    One schema for many classes, sharing the $defs of the classes they refer to.
+    $roots maps each class name to its definition.
+    """
     spec = {
         '$defs': {},
-        '$root': f'#/$defs/{schema.__name__}'
+        '$roots': {schema.__name__: f'#/$defs/{schema.__name__}' for schema in schemas}
     }
-    _update_spec(schema, spec)
+    for schema in schemas:
+        _update_spec(schema, spec)
     return spec
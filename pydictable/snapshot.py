@@ -0,0 +1,259 @@
+import hashlib
+import json
+import mmap
+import struct
+from typing import Any, IO, Iterable, Iterator, List, Type, Tuple, Union
+
+from pydictable.core import DictAble, PLAIN_FIELD_TYPES
+from pydictable.json_codec import dumps
+from pydictable.json_schema import get_json_schema
+from pydictable.type import Field, get_generation
+
+# File layout: a fixed header, the header JSON (class, field keys, schema), one record per object made of a
+# fixed size slot per field, then the heap holding the strings and the JSON of every other value.
+# A slot is a tag byte and 8 bytes: an int64, a float64 or the heap offset of a length prefixed UTF-8 text.
+SNAPSHOT_MAGIC = b'PYDSNAP\x00'
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct('<8sHIQ')  # magic, format version, header JSON length, record count
+_SLOT_SIZE = 9
+_INT_SLOT = struct.Struct('<Bq')
+_FLOAT_SLOT = struct.Struct('<Bd')
+_HEAP_SLOT = struct.Struct('<BQ')
+_INT64 = struct.Struct('<q')
+_FLOAT64 = struct.Struct('<d')
+_OFFSET = struct.Struct('<Q')
+_LENGTH = struct.Struct('<I')
+
+_NONE, _INT, _FLOAT, _TRUE, _FALSE, _STR, _JSON = range(7)
+_EMPTY_SLOTS = {None: bytes([_NONE]) + bytes(8), True: bytes([_TRUE]) + bytes(8), False: bytes([_FALSE]) + bytes(8)}
+_INT64_RANGE = range(-(1 << 63), 1 << 63)
+
+
+class SnapshotSchemaError(Exception):
+    """
+    Raised by load_snapshot for a snapshot written with another schema of the class, see get_json_schema
+    """
+
+    def __init__(self, message: str, stored: dict, current: dict):
+        super(SnapshotSchemaError, self).__init__(message)
+        self.stored = stored
+        self.current = current
+
+
+def _fingerprint(schema: dict) -> str:
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest()
+
+
+def write_snapshot(cls: Type[DictAble], objs: Iterable[DictAble], file: Union[str, IO]) -> int:
+    """
+    Writes instances of cls to a path or binary file object, to be opened later with load_snapshot.
+    Returns the number of records written.
+    """
+    fields = cls.get_fields()
+    plan = [(attr, field, type(field) in PLAIN_FIELD_TYPES) for attr, field in fields.items()]
+    schema = get_json_schema(cls, new_schema=True)
+    header = dumps({
+        'class': cls.__qualname__,
+        'keys': [cls.get_field_key(attr) for attr in fields],
+        'schema': schema,
+        'fingerprint': _fingerprint(schema)
+    }).encode('utf-8')
+    records, heap, count = bytearray(), bytearray(), 0
+    for obj in objs:
+        if not isinstance(obj, cls):
+            raise TypeError(f'Expected {cls.__name__} instances, got {type(obj).__name__}')
+        for attr, field, plain in plan:
+            v = getattr(obj, attr)
+            if plain and type(v) is int and v in _INT64_RANGE:
+                records += _INT_SLOT.pack(_INT, v)
+            elif plain and type(v) is float:
+                records += _FLOAT_SLOT.pack(_FLOAT, v)
+            elif v is None or (plain and type(v) is bool):
+                records += _EMPTY_SLOTS[v]
+            else:
+                if plain and type(v) is str:
+                    tag, text = _STR, v
+                else:
+                    out = []
+                    field.write_json(v, False, out)
+                    tag, text = _JSON, ''.join(out)
+                data = text.encode('utf-8', 'surrogatepass')
+                records += _HEAP_SLOT.pack(tag, len(heap))
+                heap += _LENGTH.pack(len(data))
+                heap += data
+        count += 1
+
+    fileobj = open(file, 'wb') if isinstance(file, str) else file
+    try:
+        fileobj.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(header), count))
+        fileobj.write(header)
+        fileobj.write(records)
+        fileobj.write(heap)
+    finally:
+        if fileobj is not file:
+            fileobj.close()
+    return count
+
+
+class _SnapshotAttribute:
+    """
+    Stands in for a field on the snapshot view of a class. The first read decodes the value from the slot of the
+    instance record, it is then stored in the instance __dict__ which takes precedence over this non data
+    descriptor on every later read. Read on the class it gives the Field back.
+    """
+    __slots__ = ('name', 'field')
+
+    def __init__(self, name: str, field: Field):
+        self.name = name
+        self.field = field
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self.field
+        try:
+            snapshot, pos = obj.__dict__['_snapshot_row']
+        except KeyError:
+            raise AttributeError(self.name) from None
+        value = obj.__dict__[self.name] = snapshot._read(pos + snapshot._offsets[self.name], self.field)
+        return value
+
+
+def _reduce_snapshot_instance(self):
+    # Pickled and copied as a regular instance, the snapshot it reads from stays behind
+    return self._snapshot_class.from_trusted, (self.to_dict(),)
+
+
+def _get_view_class(cls: Type[DictAble]) -> Type[DictAble]:
+    # (generation, subclass of cls reading its fields from a snapshot record), kept on the class like the fields cache
+    cache = cls.__dict__.get('_snapshot_view')
+    if cache is None or cache[0] != get_generation(cls):
+        generation = get_generation(cls)
+        namespace = {attr: _SnapshotAttribute(attr, field) for attr, field in cls.get_fields().items()}
+        namespace.update({
+            # compact classes have no __dict__, the decoded values of the view need one
+            '__slots__': () if cls.__dictoffset__ else ('__dict__',),
+            '__module__': cls.__module__,
+            '__qualname__': cls.__qualname__,
+            '__reduce__': _reduce_snapshot_instance,
+            '_lazy': False,
+            '_snapshot_class': cls,
+        })
+        cache = (generation, type(cls)(cls.__name__, (cls,), namespace))
+        type.__setattr__(cls, '_snapshot_view', cache)
+    return cache[1]
+
+
+class Snapshot:
+    """
+    The records of a snapshot file as a read only sequence of cls instances, see load_snapshot
+    """
+
+    def __init__(self, cls: Type[DictAble], path: str, migrate: bool = False):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        try:
+            if self._buffer[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC or len(self._buffer) < _HEADER.size:
+                raise ValueError(f'{path} is not a snapshot')
+            _, version, header_size, count = _HEADER.unpack_from(self._buffer, 0)
+            if version != SNAPSHOT_VERSION:
+                raise ValueError(f'Unsupported snapshot format version {version} in {path}')
+            header = json.loads(str(self._buffer[_HEADER.size:_HEADER.size + header_size], 'utf-8'))
+            self._slots = {key: i * _SLOT_SIZE for i, key in enumerate(header['keys'])}
+            self._records = _HEADER.size + header_size
+            self._record_size = _SLOT_SIZE * len(self._slots)
+            self._heap = self._records + count * self._record_size
+            if self._heap > len(self._buffer):
+                raise ValueError(f'{path} is truncated')
+        except ValueError:
+            self.close()
+            raise
+        self.cls = cls
+        self.schema = header['schema']
+        self._count = count
+        current = get_json_schema(cls, new_schema=True)
+        self.migrated = header['fingerprint'] != _fingerprint(current)
+        if self.migrated and not migrate:
+            self.close()
+            raise SnapshotSchemaError(
+                f'{path} was written for another schema of {cls.__name__}, load it with migrate=True',
+                self.schema, current
+            )
+        if not self.migrated:
+            self._view_class = _get_view_class(cls)
+            self._offsets = {attr: self._slots[cls.get_field_key(attr)] for attr in cls.get_fields()}
+
+    def _read_raw(self, pos: int) -> Tuple[int, Any]:
+        buffer = self._buffer
+        tag = buffer[pos]
+        if tag == _INT:
+            return tag, _INT64.unpack_from(buffer, pos + 1)[0]
+        if tag == _FLOAT:
+            return tag, _FLOAT64.unpack_from(buffer, pos + 1)[0]
+        if tag <= _FALSE:
+            return tag, None if tag == _NONE else tag == _TRUE
+        start = self._heap + _OFFSET.unpack_from(buffer, pos + 1)[0]
+        end = start + _LENGTH.size + _LENGTH.unpack_from(buffer, start)[0]
+        text = str(buffer[start + _LENGTH.size:end], 'utf-8', 'surrogatepass')
+        return tag, text if tag == _STR else json.loads(text)
+
+    def _read(self, pos: int, field: Field):
+        tag, value = self._read_raw(pos)
+        return field.from_trusted(value) if tag == _JSON else value
+
+    def get_raw(self, index: int) -> dict:
+        """
+        The record as a raw dict keyed like the snapshot schema, the same dict as to_dict() of the written instance
+        """
+        pos = self._record_pos(index)
+        return {key: self._read_raw(pos + offset)[1] for key, offset in self._slots.items()}
+
+    def _record_pos(self, index: int) -> int:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('snapshot index out of range')
+        return self._records + index * self._record_size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[DictAble, List[DictAble]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if self.migrated:
+            return self.cls(dict=self.get_raw(index))
+        obj = self._view_class.__new__(self._view_class)
+        obj._snapshot_row = (self, self._record_pos(index))
+        return obj
+
+    def __iter__(self) -> Iterator[DictAble]:
+        for i in range(self._count):
+            yield self[i]
+
+    def close(self):
+        """
+        Unmaps the file, fields of the instances not read yet can not be read anymore
+        """
+        self._buffer.release()
+        self._mmap.close()
+
+    def __enter__(self) -> 'Snapshot':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load_snapshot(cls: Type[DictAble], path: str, migrate: bool = False) -> Snapshot:
+    """
+    Opens a file written by write_snapshot as a sequence of cls instances, without reading its records.
+    The file is memory mapped read only, so its pages are shared by every process loading it. Instances are made
+    on access and point into the mapping, each field is decoded from it on first read like from_trusted would,
+    without validation. They are instances of a subclass of cls.
+    The class schema (get_json_schema) is stored in the file, a snapshot written for another schema raises
+    SnapshotSchemaError unless migrate is set: records are then matched by key and built with cls(dict=...)
+    on access, validated like any raw dict.
+    """
+    return Snapshot(cls, path, migrate)
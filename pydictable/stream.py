@@ -0,0 +1,109 @@
+import codecs
+import json
+from typing import Any, Iterator, IO
+
+JSON_WHITESPACE = ' \t\n\r'
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def iter_jsonl(fileobj: IO) -> Iterator[Any]:
+    """
+    Yields the value of every non blank line of a JSON Lines text/binary file object or mmap
+    """
+    readline = fileobj.readline
+    while True:
+        line = readline()
+        if not line:
+            return
+        if line.strip():
+            yield json.loads(line)
+
+
+class _Reader:
+    def __init__(self, fileobj: IO, chunk_size: int):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.decoder = None
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, min_size: int) -> bool:
+        """
+        Reads until at least min_size characters are buffered after pos, returns False when nothing is left
+        """
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        while len(self.buffer) < min_size and not self.eof:
+            chunk = self.fileobj.read(self.chunk_size)
+            if not chunk:
+                self.eof = True
+                if self.decoder is not None:
+                    self.buffer += self.decoder.decode(b'', final=True)
+                break
+            if not isinstance(chunk, str):
+                if self.decoder is None:
+                    self.decoder = codecs.getincrementaldecoder('utf-8')()
+                chunk = self.decoder.decode(chunk)
+            self.buffer += chunk
+        return len(self.buffer) > 0
+
+    def skip_whitespace(self) -> str:
+        """
+        Returns the next non whitespace character without consuming it, '' at the end of the file
+        """
+        while True:
+            buffer, pos = self.buffer, self.pos
+            while pos < len(buffer) and buffer[pos] in JSON_WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self.fill(1):
+                return ''
+
+    def expect(self, chars: str) -> str:
+        char = self.skip_whitespace()
+        if char == '' or char not in chars:
+            raise json.JSONDecodeError(f'Expecting one of {chars!r}', self.buffer, self.pos)
+        self.pos += 1
+        return char
+
+    def expect_end(self):
+        if self.skip_whitespace() != '':
+            raise json.JSONDecodeError('Extra data', self.buffer, self.pos)
+
+
+def iter_json_array(fileobj: IO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yields the elements of a top level JSON array one by one, reading the text/binary file object or mmap in chunks.
+    Only the element being parsed is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    reader = _Reader(fileobj, chunk_size)
+    reader.expect('[')
+    if reader.skip_whitespace() == ']':
+        reader.pos += 1
+        reader.expect_end()
+        return
+    while True:
+        reader.skip_whitespace()
+        wanted = chunk_size
+        while True:
+            try:
+                value, end = decoder.raw_decode(reader.buffer, reader.pos)
+            except json.JSONDecodeError:
+                if reader.eof:
+                    raise
+                value, end = None, None
+            # A value touching the end of the buffer may be cut, like a number or a partial object
+            if end is not None and (end < len(reader.buffer) or reader.eof):
+                break
+            wanted = max(wanted, len(reader.buffer) - reader.pos) * 2
+            reader.fill(wanted)
+        reader.pos = end
+        yield value
+        if reader.expect(',]') == ']':
+            reader.expect_end()
+            return
@@ -0,0 +1,86 @@
+from typing import List
+from unittest import TestCase
+
+from pydictable import test_core
+from pydictable.core import DictAble
+from pydictable.field import DataValidationError, IntField, ListField, ObjectField, StrField
+
+
+class _CompiledDictAble(DictAble, compiled=True):
+    pass
+
+
+class TestCompiledCore(test_core.TestCore):
+    """
+    Runs the whole core suite against classes using the generated decoder/encoder
+    """
+
+    def setUp(self):
+        test_core.DictAble = _CompiledDictAble
+
+    def tearDown(self):
+        test_core.DictAble = DictAble
+
+
+class TestCodegen(TestCase):
+    def test_compiled_matches_generic(self):
+        class LatLng(DictAble, compiled=True):
+            lat: int
+            lng: int
+
+        class Address(DictAble, compiled=True):
+            pin_code: int
+            lat_lng: LatLng
+            tags: List[str] = ListField(StrField())
+
+        class Person(DictAble, compiled=True):
+            name: str
+            address: Address
+            age: int = IntField(key='_age', default=18)
+
+        class GenericAddress(DictAble):
+            pin_code: int
+            lat_lng: LatLng
+            tags: List[str] = ListField(StrField())
+
+        d = {'name': 'Pramod', 'address': {'pin_code': 560032, 'lat_lng': {'lat': 1, 'lng': 2}, 'tags': ['home']}}
+        p = Person(dict=d)
+        self.assertIsInstance(p.address.lat_lng, LatLng)
+        self.assertEqual(p.age, 18)
+        self.assertEqual(p.to_dict(), {**d, '_age': 18})
+        self.assertEqual(p.address.to_dict(skip_optional=True), GenericAddress(dict=d['address']).to_dict(True))
+
+        try:
+            Person(dict={'name': 'Pramod', 'address': {'pin_code': 1, 'lat_lng': {'lat': 1, 'lng': '2'}}})
+            raise AssertionError('It should fail')
+        except DataValidationError as e:
+            self.assertEqual(e.path, 'address.lat_lng.lng')
+
+        try:
+            Address(dict={'pin_code': 1, 'lat_lng': {'lat': 1, 'lng': 2}, 'tags': ['a', 1]})
+            raise AssertionError('It should fail')
+        except DataValidationError as e:
+            self.assertEqual(e.path, 'tags.[1]')
+
+    def test_list_of_objects_error_path(self):
+        class Item(DictAble, compiled=True):
+            qty: int
+
+        class Cart(DictAble, compiled=True):
+            items: List[Item] = ListField(ObjectField(Item))
+
+        self.assertEqual(Cart(dict={'items': [{'qty': 1}]}).items[0].qty, 1)
+        try:
+            Cart(dict={'items': [{'qty': 1}, {'qty': 'one'}]})
+            raise AssertionError('It should fail')
+        except DataValidationError as e:
+            self.assertEqual(e.path, 'items.[1].qty')
+
+    def test_recompiled_after_field_change(self):
+        class Counter(DictAble, compiled=True):
+            count: int
+
+        self.assertEqual(Counter(dict={'count': 1}).to_dict(), {'count': 1})
+        Counter.label = IntField(required=True)
+        self.assertRaises(DataValidationError, lambda: Counter(dict={'count': 1}))
+        self.assertEqual(Counter(dict={'count': 1, 'label': 2}).to_dict(), {'count': 1, 'label': 2})
@@ -0,0 +1,70 @@
+import sys
+from typing import List
+from unittest import TestCase
+
+from pydictable import test_core
+from pydictable.core import DictAble
+from pydictable.field import IntField, ListField, StrField
+
+
+class _CompactDictAble(DictAble, compact=True):
+    pass
+
+
+class TestCompactCore(test_core.TestCore):
+    """
+    Runs the whole core suite against __slots__ backed classes
+    """
+
+    def setUp(self):
+        test_core.DictAble = _CompactDictAble
+
+    def tearDown(self):
+        test_core.DictAble = DictAble
+
+    def test_fields_cache(self):
+        class Person(_CompactDictAble):
+            name: str = StrField()
+            age: int
+
+        Person.get_fields()
+        cache = Person.__dict__['_DictAble__fields_cache']
+        Person.age = IntField(key='_age')
+        Person.get_fields()
+        self.assertIsNot(Person.__dict__['_DictAble__fields_cache'], cache)
+        self.assertEqual(Person.get_field_key('age'), '_age')
+        self.assertEqual(Person(dict={'name': 'Pramod', '_age': 30}).age, 30)
+
+        def add_field():
+            Person.city = StrField()
+
+        self.assertRaises(TypeError, add_field)
+
+
+class TestCompact(TestCase):
+    def test_slots(self):
+        class LatLng(DictAble, compact=True):
+            lat: int
+            lng: int = IntField(default=5)
+
+        class Polygon(LatLng):
+            name = StrField(required=True)
+            points: List[int] = ListField(IntField())
+
+        p = LatLng(dict={'lat': 1})
+        self.assertFalse(hasattr(p, '__dict__'))
+        self.assertEqual(p.to_dict(), {'lat': 1, 'lng': 5})
+        self.assertRaises(AttributeError, lambda: setattr(p, 'other', 1))
+        self.assertEqual(list(Polygon.get_fields()), ['name', 'points', 'lng', 'lat'])
+
+        polygon = Polygon(dict={'lat': 1, 'name': 'square', 'points': [1, 2]})
+        self.assertFalse(hasattr(polygon, '__dict__'))
+        self.assertEqual(polygon.to_dict(), {'name': 'square', 'points': [1, 2], 'lng': 5, 'lat': 1})
+        self.assertEqual(Polygon.from_trusted(polygon.to_dict()).points, [1, 2])
+
+        class Point(DictAble):
+            lat: int
+            lng: int
+
+        self.assertLess(sys.getsizeof(LatLng(lat=1)), sys.getsizeof(Point(lat=1, lng=2)) +
+                        sys.getsizeof(Point(lat=1, lng=2).__dict__))
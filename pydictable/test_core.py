@@ -1,11 +1,14 @@
+import abc
+import asyncio
 import json
 import math
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
 from time import sleep
 from typing import List, Dict, Optional, Union, Any
 from unittest import TestCase
-from pydictable.core import DictAble, partial
+from pydictable.core import DictAble, partial, BatchValidationError
 from pydictable.field import IntField, StrField, ListField, ObjectField, DatetimeField, CustomField, MultiTypeField, \
     EnumField, DictField, DictValueField, UnionField, DataValidationError, RegexField, RangeIntField, RangeFloatField, \
     FloatField, BoolField, NoneField
@@ -343,6 +346,95 @@ class TestCore(TestCase):
         self.assertRaises(DataValidationError, lambda: User(dict={'meta': False}))
         User(dict={'meta': {}})
 
+    def test_custom_validate_and_init(self):
+        class UpperField(StrField):
+            def from_dict(self, v):
+                return v.upper()
+
+            def validate(self, field_name: str, v):
+                super().validate(field_name, v)
+                assert v != 'BAD'
+
+        class Name(DictAble):
+            first: str = UpperField(required=True)
+            last: str
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.last = self.last.title()
+
+        class User(DictAble):
+            name: Name
+            names: List[Name]
+
+        self.assertEqual(Name(dict={'first': 'a', 'last': 'b'}).first, 'A')
+        self.assertRaisesRegex(DataValidationError, 'Post check failed', Name, dict={'first': 'bad', 'last': 'b'})
+        raw = {'name': {'first': 'a', 'last': 'b'}, 'names': [{'first': 'c', 'last': 'd'}]}
+        for user in (User(dict=raw), User.from_dicts([raw])[0], User.from_trusted(raw)):
+            self.assertEqual((user.name.last, user.names[0].last), ('B', 'D'))
+        self.assertRaises(DataValidationError, lambda: User(dict={'name': {'first': 'bad', 'last': 'b'}}))
+
+    def test_metaclass(self):
+        class Shape(DictAble, abc.ABC):
+            name: str
+
+            @abc.abstractmethod
+            def area(self) -> float:
+                pass
+
+        class Square(Shape):
+            side: float
+
+            def area(self) -> float:
+                return self.side ** 2
+
+        self.assertRaises(TypeError, lambda: Shape(dict={'name': 'a'}))
+        self.assertEqual(Square(dict={'name': 'a', 'side': 2.0}).area(), 4.0)
+
+        class OtherMeta(type):
+            pass
+
+        class Other(metaclass=OtherMeta):
+            pass
+
+        class ModelMeta(type(DictAble), OtherMeta):
+            pass
+
+        class Model(DictAble, Other, metaclass=ModelMeta):
+            name: str
+
+        self.assertEqual(Model(dict={'name': 'a'}).to_dict(), {'name': 'a'})
+
+    def test_nested_hook_error_path(self):
+        class LatLng(DictAble):
+            lat: int
+
+            def validate(self):
+                assert self.lat >= 0, 'lat should not be negative'
+
+        class Place(DictAble):
+            ll: LatLng
+            many: List[LatLng]
+            by_name: Dict[str, LatLng]
+
+        good = {'lat': 1}
+        for bad, path in [
+            ({'ll': {'lat': -1}, 'many': [], 'by_name': {}}, 'll'),
+            ({'ll': good, 'many': [good, {'lat': -1}], 'by_name': {}}, 'many.[1]'),
+            ({'ll': good, 'many': [], 'by_name': {'a': {'lat': -1}}}, 'by_name.a'),
+        ]:
+            for build in (lambda d: Place(dict=d), lambda d: asyncio.run(Place.afrom_dict(d, chunk_size=1))):
+                try:
+                    build(bad)
+                    raise AssertionError('It should fail')
+                except DataValidationError as e:
+                    self.assertEqual(e.path, path)
+            try:
+                Place.from_dicts([bad])
+                raise AssertionError('It should fail')
+            except DataValidationError as e:
+                self.assertEqual(e.path, f'[0].{path}')
+
     def test_dict_value_field(self):
         class Address(DictAble):
             pin: str = StrField(required=True)
@@ -1087,3 +1179,380 @@ class TestCore(TestCase):
 
         self.assertRaisesRegex(DataValidationError, 'Validation failed with error: ', Person,
                                dict={'first_name': 'F', 'last_name': 'B'})
+
+    def test_fields_cache(self):
+        class Person(DictAble):
+            name: str = StrField()
+
+        Person.get_fields().pop('name')  # a copy, the cache is left alone
+        self.assertEqual(list(Person.get_fields()), ['name'])
+        cache = Person.__dict__['_DictAble__fields_cache']
+        Person(dict={'name': 'Pramod'})
+
+        class Other(DictAble):
+            name: str = StrField()
+
+        Other.name = StrField(required=True)  # fields of unrelated classes do not matter
+        Person.get_fields()
+        self.assertIs(Person.__dict__['_DictAble__fields_cache'], cache)
+
+        Person.age = IntField(key='_age')
+        Person.get_fields()
+        self.assertIsNot(Person.__dict__['_DictAble__fields_cache'], cache)
+        self.assertEqual(list(Person.get_fields().keys()), ['name', 'age'])
+        self.assertEqual(Person.get_field_key('age'), '_age')
+        self.assertEqual(Person(dict={'name': 'Pramod', '_age': 30}).age, 30)
+
+        class Employee(Person):
+            pass
+
+        self.assertEqual(set(Employee.get_fields().keys()), {'name', 'age'})
+        del Person.age
+        self.assertEqual(list(Person.get_fields().keys()), ['name'])
+        self.assertEqual(list(Employee.get_fields().keys()), ['name'])
+
+    def test_dependent_caches(self):
+        class LatLng(DictAble):
+            lat: int
+
+        class Address(DictAble):
+            lat_lng: LatLng
+
+        Address.get_input_spec()
+        cache = Address.__dict__['_DictAble__input_spec']
+
+        class Other(DictAble):
+            name: str = StrField()
+
+        Other.name = StrField(required=True)  # fields of unrelated classes do not matter
+        Address.get_input_spec()
+        self.assertIs(Address.__dict__['_DictAble__input_spec'], cache)
+
+        LatLng.lat = IntField(key='latitude')
+        self.assertEqual(list(Address.get_input_spec()['lat_lng']['of']), ['latitude'])
+
+    def test_from_trusted(self):
+        class Gender(Enum):
+            male = 'M'
+            female = 'F'
+
+        class LatLng(DictAble):
+            lat: int
+            lng: int
+
+        class Address(DictAble):
+            pin_code: int
+            lat_lng: LatLng
+            visits: List[datetime]
+
+        class Person(DictAble):
+            name: str
+            gender: Gender
+            addresses: List[Address]
+            tags: Dict[str, LatLng]
+            roll_no: Union[int, LatLng]
+            nick: str = StrField(default='none')
+
+            def validate(self):
+                assert self.name != 'invalid'
+
+        d = {
+            'name': 'Pramod',
+            'gender': 'male',
+            'addresses': [{'pin_code': 560032, 'lat_lng': {'lat': 1, 'lng': 2}, 'visits': [1672425000000]}],
+            'tags': {'home': {'lat': 3, 'lng': 4}},
+            'roll_no': {'lat': 5, 'lng': 6}
+        }
+        p = Person.from_trusted(d)
+        self.assertEqual(p.gender, Gender.male)
+        self.assertIsInstance(p.addresses[0].lat_lng, LatLng)
+        self.assertEqual(p.addresses[0].visits[0], datetime(2022, 12, 31))
+        self.assertEqual(p.tags['home'].lng, 4)
+        self.assertEqual(p.roll_no.lat, 5)
+        self.assertEqual(p.nick, 'none')
+        self.assertEqual(p.to_dict(), Person(dict=d).to_dict())
+
+        self.assertEqual(Person.from_trusted({**d, 'name': 'invalid'}).name, 'invalid')
+        self.assertEqual(Person.from_trusted({'name': 'Pramod'}).addresses, None)
+
+    def test_from_dicts(self):
+        class LatLng(DictAble):
+            lat: int
+            lng: int
+
+        class Address(DictAble):
+            pin_code: int
+            lat_lng: LatLng
+
+            def validate(self):
+                assert self.pin_code > 0, 'pin_code should be positive'
+
+        rows = [{'pin_code': i + 1, 'lat_lng': {'lat': i, 'lng': i}} for i in range(5)]
+        addresses = Address.from_dicts(iter(rows))
+        self.assertEqual(len(addresses), 5)
+        self.assertEqual(addresses[3].lat_lng.lat, 3)
+        self.assertEqual(Address.to_dicts(addresses), rows)
+        self.assertEqual(Address.from_dicts([]), [])
+
+        rows[1]['lat_lng']['lat'] = 'x'
+        rows[3] = {'pin_code': -1, 'lat_lng': {'lat': 1, 'lng': 1}}
+        rows[4] = 'invalid'
+        try:
+            Address.from_dicts(rows)
+            raise AssertionError('It should fail')
+        except DataValidationError as e:
+            self.assertEqual(e.path, '[1].lat_lng.lat')
+
+        try:
+            Address.from_dicts(rows, collect_errors=True)
+            raise AssertionError('It should fail')
+        except BatchValidationError as e:
+            self.assertEqual([error.path for error in e.errors], ['[1].lat_lng.lat', '[3]', '[4]'])
+            self.assertEqual(e.path, '[1].lat_lng.lat')
+            self.assertEqual(e.errors[1].err, 'Validation failed with error: pin_code should be positive')
+
+    def test_validate_dict_builds_nothing(self):
+        class NotBuilt(DictAble):
+            def __new__(cls, *args, **kwargs):
+                raise AssertionError(f'{cls.__name__} should not be built while validating')
+
+        class LatLng(NotBuilt):
+            lat: int
+            lng: int
+
+        class Car(NotBuilt):
+            name: str
+
+        class Bike(NotBuilt):
+            gears: int
+
+        class Person(DictAble):
+            name: str
+            home: LatLng
+            places: Dict[str, LatLng] = DictValueField(LatLng)
+            history: List[Optional[LatLng]]
+            vehicle = MultiTypeField([Car, Bike])
+
+        d = {
+            'name': 'Pramod',
+            'home': {'lat': 1, 'lng': 2},
+            'places': {'office': {'lat': 3, 'lng': 4}},
+            'history': [None, {'lat': 5, 'lng': 6}],
+            'vehicle': {'__type': 'Bike', 'gears': 5}
+        }
+        Person.validate_dict(d)
+        self.assertRaisesRegex(DataValidationError, 'Invalid __type Plane', Person.validate_dict,
+                               {**d, 'vehicle': {'__type': 'Plane'}})
+        self.assertRaises(DataValidationError, Person.validate_dict, {**d, 'places': {'office': {'lat': 3}}})
+        self.assertRaises(DataValidationError, Person.validate_dict, {**d, 'places': {'office': 3}})
+        self.assertRaisesRegex(DataValidationError, 'Expected a dict, got list', Person.validate_dict, [])
+
+    def test_collect_errors(self):
+        class LatLng(DictAble):
+            lat: int
+            lng: int
+
+        class Address(DictAble):
+            pin_code: int
+            lat_lng: LatLng
+            history: List[LatLng]
+            tags: List[str]
+            meta: Dict[str, int]
+
+        d = {
+            'pin_code': 560001,
+            'lat_lng': {'lat': 1, 'lng': 2},
+            'history': [{'lat': 1, 'lng': 2}],
+            'tags': ['home'],
+            'meta': {'floor': 2}
+        }
+        self.assertEqual(Address.collect_errors(d), [])
+
+        d = {
+            'pin_code': 'x',
+            'lat_lng': {'lat': 'a'},
+            'history': [{'lat': 1, 'lng': 2}, {'lat': 'b', 'lng': 2}, 3],
+            'tags': ['home', 1],
+            'meta': {'floor': 'two'}
+        }
+        self.assertEqual(Address.collect_errors(d), [
+            ('pin_code', 'Pre check failed: Invalid value x for field pin_code'),
+            ('lat_lng.lat', 'Pre check failed: Invalid value a for field lat'),
+            ('lat_lng.lng', 'Pre check failed: Invalid value None for field lng'),
+            ('history.[1].lat', 'Pre check failed: Invalid value b for field lat'),
+            ('history.[2]', 'Invalid value 3'),
+            ('tags.[1]', 'Invalid value 1'),
+            ('meta.floor', 'Invalid value, two'),
+        ])
+        self.assertEqual([path for path, _ in Address.collect_errors(d, max_errors=3)],
+                         ['pin_code', 'lat_lng.lat', 'lat_lng.lng'])
+        self.assertEqual(Address.collect_errors([]), [('.', 'Expected a dict, got list')])
+
+    def test_columns(self):
+        class LatLng(DictAble):
+            lat: int
+            lng: int = IntField(key='long')
+
+        class Address(DictAble):
+            pin_code: int
+            lat_lng: LatLng
+            tags: List[str]
+            note: str = StrField()
+
+        rows = [
+            {'pin_code': 1, 'lat_lng': {'lat': 1, 'long': 2}, 'tags': ['home'], 'note': None},
+            {'pin_code': 2, 'lat_lng': {'lat': 3, 'long': 4}, 'tags': [], 'note': 'gate'},
+        ]
+        addresses = Address.from_dicts(rows)
+        columns = Address.to_columns(addresses)
+        self.assertEqual(columns, {
+            'pin_code': [1, 2], 'lat_lng': [True, True], 'lat_lng.lat': [1, 3], 'lat_lng.long': [2, 4], 'tags': [['home'], []],
+            'note': [None, 'gate']
+        })
+        self.assertEqual(Address.to_dicts(Address.from_columns(columns)), rows)
+        self.assertEqual(list(Address.to_columns(addresses, arrays=True)['pin_code']), [1, 2])
+        self.assertEqual(Address.to_dicts(Address.from_columns(Address.to_columns(addresses, arrays=True))), rows)
+        self.assertEqual(Address.from_columns({}), [])
+        Address.validate_columns(columns)
+
+        try:
+            Address.validate_columns({**columns, 'lat_lng.lat': [1, 'x']})
+            raise AssertionError('It should fail')
+        except DataValidationError as e:
+            self.assertEqual(e.path, '[1].lat_lng.lat')
+        try:
+            Address.from_columns({**columns, 'lat_lng': [False, True]})
+            raise AssertionError('It should fail')
+        except DataValidationError as e:
+            self.assertEqual(e.path, '[0].lat_lng')
+        try:
+            # without a presence column a nested object whose values are all None is None
+            columns.pop('lat_lng')
+            Address.from_columns({**columns, 'lat_lng.lat': [None, None], 'lat_lng.long': [None, None]})
+            raise AssertionError('It should fail')
+        except DataValidationError as e:
+            self.assertEqual(e.path, '[0].lat_lng')
+
+        class Tag(DictAble):
+            label: Optional[str]
+            color: Optional[str]
+
+        class Item(DictAble):
+            tag: Tag
+            count: Optional[int]
+
+        items = Item.from_dicts([{'tag': {}}, {'tag': {'color': 'red'}, 'count': 1}])
+        columns = Item.to_columns(items)
+        self.assertEqual(columns['tag'], [True, True])
+        self.assertEqual(Item.to_dicts(Item.from_columns(columns)), Item.to_dicts(items))
+        self.assertEqual(Item.to_dicts(Item.from_columns(Item.to_columns(items, arrays=True))), Item.to_dicts(items))
+        item, = Item.from_columns({'tag': [True]})
+        self.assertIsNotNone(item.tag)
+        self.assertIsNone(item.tag.label)
+        self.assertRaises(ValueError, lambda: Address.from_columns({**columns, 'pin_code': [1]}))
+
+    def test_to_json(self):
+        class Color(Enum):
+            RED = 'red'
+
+        class LatLng(DictAble):
+            lat: float
+            lng: float = FloatField(key='long')
+
+        class Place(DictAble):
+            name: str
+            visits: int
+            open: bool
+            at: datetime
+            color: Color
+            home: LatLng
+            path: List[LatLng]
+            tags: List[str]
+            meta: Dict[str, int]
+            note: str = StrField()
+            last: LatLng = ObjectField(LatLng)
+
+        place = Place(dict={
+            'name': 'Café "Zoë"\n', 'visits': 3, 'open': True, 'at': 1617129000123, 'color': 'RED',
+            'home': {'lat': 1.5, 'long': -2.25}, 'path': [{'lat': 0.1, 'long': 1e300}], 'tags': ['a', 'ß'],
+            'meta': {'x': 1}
+        })
+        for skip_optional in (False, True):
+            expected = json.dumps(place.to_dict(skip_optional), separators=(',', ':'), ensure_ascii=False)
+            self.assertEqual(place.to_json(skip_optional), expected)
+            self.assertEqual(place.to_json_bytes(skip_optional), expected.encode())
+        self.assertEqual(LatLng(lat=math.nan, lng=math.inf).to_json(), '{"long":Infinity,"lat":NaN}')
+
+        class Inner(DictAble):
+            a: int
+
+            def to_dict(self, skip_optional: bool = False) -> dict:
+                return {**super().to_dict(skip_optional), 'extra': 1}
+
+        class Outer(DictAble):
+            inner: Inner
+            inners: List[Inner]
+
+            def to_dict(self, skip_optional: bool = False) -> dict:
+                return {**super().to_dict(skip_optional), 'extra': 2}
+
+        outer = Outer(dict={'inner': {'a': 1}, 'inners': [{'a': 2}]})
+        self.assertEqual(outer.to_json(), json.dumps(outer.to_dict(), separators=(',', ':')))
+        self.assertEqual(json.loads(outer.to_json())['inners'], [{'a': 2, 'extra': 1}])
+
+        class Holder(DictAble):
+            inner: Inner
+            inners: List[Inner]
+
+        holder = Holder(dict={'inner': {'a': 1}, 'inners': [{'a': 2}]})
+        self.assertEqual(holder.to_json(), '{"inner":{"a":1,"extra":1},"inners":[{"a":2,"extra":1}]}')
+
+    def test_async(self):
+        class LatLng(DictAble):
+            lat: int
+            lng: int
+
+        class Track(DictAble):
+            name: str
+            points: List[LatLng]
+            ticks: List[int]
+            meta: Dict[str, int]
+            home: LatLng = ObjectField(LatLng)
+
+        d = {
+            'name': 'run', 'points': [{'lat': i, 'lng': i} for i in range(2500)], 'ticks': list(range(2500)),
+            'meta': {f'k{i}': i for i in range(2500)}
+        }
+        switches = []
+
+        async def decode(coroutine):
+            async def tick():
+                while True:
+                    switches.append(1)
+                    await asyncio.sleep(0)
+
+            ticker = asyncio.ensure_future(tick())
+            try:
+                return await coroutine
+            finally:
+                ticker.cancel()
+
+        track = asyncio.run(decode(Track.afrom_dict(d, chunk_size=100)))
+        self.assertEqual(track.to_dict(), Track(dict=d).to_dict())
+        self.assertGreater(len(switches), 50)
+        asyncio.run(decode(Track.avalidate_dict(d, chunk_size=100)))
+        with ThreadPoolExecutor(1) as executor:
+            self.assertEqual(asyncio.run(Track.afrom_dict(d, executor=executor)).to_dict(), track.to_dict())
+            asyncio.run(Track.avalidate_dict(d, executor=executor))
+
+        for bad, path in [
+            ({**d, 'ticks': list(range(1234)) + ['x']}, 'ticks.[1234]'),
+            ({**d, 'points': d['points'][:1234] + [{'lat': 'x', 'lng': 1}]}, 'points.[1234].lat'),
+            ({**d, 'meta': {**d['meta'], 'k1234': 'x'}}, 'meta.k1234'),
+        ]:
+            for coroutine in (Track.afrom_dict(bad, chunk_size=100), Track.avalidate_dict(bad, chunk_size=100)):
+                try:
+                    asyncio.run(coroutine)
+                    raise AssertionError('It should fail')
+                except DataValidationError as e:
+                    self.assertEqual(e.path, path)
@@ -1,6 +1,11 @@
+import re
+from array import array
+from datetime import datetime, timezone, timedelta
+from typing import List
 from unittest import TestCase
 
-from pydictable import DictField, StrField, DataValidationError, DictAble, ObjectField, UnionField
+from pydictable import DictField, StrField, DataValidationError, DictAble, ObjectField, UnionField, IntField, ListField, \
+    MultiTypeField, RegexField, compile_pattern, DatetimeField, ArrayField, FloatField, BoolField
 
 
 class TestField(TestCase):
@@ -59,3 +64,187 @@ class TestField(TestCase):
 
         r = Rule(dict={'expression': {'expression': 'nested'}})
         self.assertEqual(r.expression.expression, 'nested')
+
+    def test_decode_visits_once(self):
+        calls = []
+
+        class CountingIntField(IntField):
+            def validate_dict(self, field_name: str, v):
+                calls.append(v)
+                super().validate_dict(field_name, v)
+
+        class LatLng(DictAble):
+            lat: int = CountingIntField(required=True)
+
+        class Address(DictAble):
+            lat_lng: LatLng = ObjectField(LatLng, required=True)
+            history: List[LatLng] = ListField(ObjectField(LatLng))
+
+        class Person(DictAble):
+            address: Address = ObjectField(Address, required=True)
+
+        p = Person(dict={'address': {'lat_lng': {'lat': 1}, 'history': [{'lat': 2}, {'lat': 3}]}})
+        self.assertEqual(p.address.history[1].lat, 3)
+        self.assertEqual(calls, [1, 2, 3])
+
+        try:
+            Person(dict={'address': {'lat_lng': {'lat': 1}, 'history': [{'lat': 2}, {'lat': '3'}]}})
+            raise AssertionError('It should fail')
+        except DataValidationError as e:
+            self.assertEqual(e.path, 'address.history.[1].lat')
+
+    def test_union_decode(self):
+        calls = []
+
+        class CountingStrField(StrField):
+            def validate_dict(self, field_name: str, v):
+                calls.append(v)
+                super().validate_dict(field_name, v)
+
+        field = UnionField([IntField(), CountingStrField()])
+        self.assertEqual(field.from_dict('a'), 'a')
+        self.assertEqual(field.decode('x', 1), 1)
+        self.assertEqual(calls, ['a'])
+        self.assertRaises(AssertionError, lambda: field.decode('x', 1.5))
+
+    def test_union_dispatch(self):
+        validated = []
+
+        class Event(DictAble):
+            @classmethod
+            def validate_dict(cls, raw_values: dict):
+                validated.append(cls.__name__)
+                super().validate_dict(raw_values)
+
+        class Click(Event):
+            x: int
+
+        class Scroll(Event):
+            kind: str = StrField(default='scroll')
+            delta: int
+
+        field = UnionField([ObjectField(Click), ObjectField(Scroll), IntField(), StrField()], discriminator='kind')
+        self.assertEqual(field.from_trusted('a'), 'a')
+        field.validate_dict('x', 1)
+        self.assertEqual(validated, [])
+
+        field.validate_dict('x', {'kind': 'scroll', 'delta': 3})
+        self.assertEqual(validated, ['Scroll'])
+        self.assertIsInstance(field.from_trusted({'kind': 'Click', 'x': 3}), Click)
+        self.assertRaises(AssertionError, lambda: field.validate_dict('x', {'kind': 'Click', 'delta': 3}))
+
+        del validated[:]
+        field.validate_dict('x', {'delta': 3})  # no discriminator, every object branch is tried
+        self.assertEqual(validated, ['Click', 'Scroll'])
+        self.assertRaises(AssertionError, lambda: field.validate_dict('x', 1.5))
+
+        self.assertEqual(field.to_dict(Scroll(delta=2)), {'kind': 'scroll', 'delta': 2})
+        self.assertEqual(field.to_dict('a'), 'a')
+        field.validate('x', Click(x=1))
+        self.assertRaises(AssertionError, lambda: field.validate('x', 1.5))
+
+    def test_multi_type_field(self):
+        class Car(DictAble):
+            seats: int
+
+        class Bike(DictAble):
+            gears: int = IntField()
+
+        field = MultiTypeField([Car, Bike], type_key='kind', aliases={'cycle': Bike})
+        self.assertIsInstance(field.decode('x', {'kind': 'cycle', 'gears': 3}), Bike)
+        self.assertIsInstance(field.from_trusted({'kind': 'Car', 'seats': 3}), Car)
+        field.validate_dict('x', {'kind': 'Car', 'seats': 4})
+        self.assertRaisesRegex(AssertionError, "Invalid kind Plane, expected one of \\['Car', 'Bike', 'cycle'\\]",
+                               lambda: field.validate_dict('x', {'kind': 'Plane'}))
+        self.assertRaises(DataValidationError, lambda: field.validate_dict('x', {'kind': 'Car', 'seats': '4'}))
+        self.assertEqual(field.to_dict(Bike(gears=3)), {'gears': 3, 'kind': 'Bike'})
+        self.assertEqual(field.to_dict(Bike(), skip_optional=True), {'kind': 'Bike'})
+
+    def test_regex_field(self):
+        field = RegexField(r'[a-z]+')
+        field.validate_dict('x', 'abc1')
+        self.assertRaisesRegex(AssertionError, 'ABC for x should be in proper format',
+                               lambda: field.validate_dict('x', 'ABC'))
+
+        field = RegexField(r'[a-z]+', fullmatch=True, flags=re.IGNORECASE)
+        field.validate_dict('x', 'ABC')
+        self.assertRaises(AssertionError, lambda: field.validate_dict('x', 'abc1'))
+        self.assertEqual(field.of(), {'regex': '[a-z]+', 'fullmatch': True, 'flags': int(re.IGNORECASE)})
+        self.assertIs(compile_pattern(r'[a-z]+', re.IGNORECASE), compile_pattern(r'[a-z]+', re.IGNORECASE))
+
+    def test_datetime_units(self):
+        field = DatetimeField(unit='us', utc=True)
+        value = field.decode('x', 1617129000123456)
+        self.assertEqual(value, datetime(2021, 3, 30, 18, 30, 0, 123456, tzinfo=timezone.utc))
+        self.assertEqual(field.to_dict(value), 1617129000123456)
+        self.assertEqual(field.to_dict(datetime(2021, 3, 30, 18, 30)), 1617129000000000)  # naive taken as UTC
+
+        field = DatetimeField(unit='s', utc=True)
+        self.assertEqual(field.decode('x', -1), datetime(1969, 12, 31, 23, 59, 59, tzinfo=timezone.utc))
+        self.assertEqual(field.to_dict(datetime(2021, 3, 31, tzinfo=timezone(timedelta(hours=5, minutes=30)))),
+                         1617129000)
+
+        field = DatetimeField()
+        self.assertEqual(field.decode('x', 1617129000123), datetime.fromtimestamp(1617129000.123))
+        self.assertEqual(field.to_dict(field.decode('x', 1617129000123)), 1617129000123)
+        self.assertRaises(AssertionError, lambda: field.decode('x', '2021-03-31'))
+        self.assertRaises(AssertionError, lambda: field.decode('x', 10 ** 20))
+        self.assertRaises(ValueError, lambda: DatetimeField(unit='ns'))
+
+    def test_datetime_iso(self):
+        field = DatetimeField(unit='iso', utc=True)
+        self.assertEqual(field.decode('x', '2021-03-31T00:00:00+05:30'), datetime(2021, 3, 30, 18, 30, tzinfo=timezone.utc))
+        self.assertEqual(field.decode('x', '2021-03-30T18:30:00Z'), datetime(2021, 3, 30, 18, 30, tzinfo=timezone.utc))
+        self.assertEqual(field.to_dict(datetime(2021, 3, 30, 18, 30)), '2021-03-30T18:30:00+00:00')
+        self.assertRaisesRegex(AssertionError, 'Invalid datetime 2021-13-01', lambda: field.validate_dict('x', '2021-13-01'))
+        self.assertRaises(AssertionError, lambda: field.validate_dict('x', 1617129000))
+        self.assertEqual(DatetimeField(unit='iso').decode('x', '2021-03-31'), datetime(2021, 3, 31))
+
+    def test_datetime_list(self):
+        field = ListField(DatetimeField(unit='s', utc=True))
+        values = field.decode('x', [0, 60])
+        self.assertEqual(values, [datetime(1970, 1, 1, tzinfo=timezone.utc), datetime(1970, 1, 1, 0, 1, tzinfo=timezone.utc)])
+        self.assertEqual(field.from_trusted([0, 60]), values)
+        self.assertEqual(field.to_dict(values), [0, 60])
+        try:
+            field.decode('x', [0, 'a'])
+            raise AssertionError('It should fail')
+        except DataValidationError as e:
+            self.assertEqual(e.path, '[1]')
+        try:
+            field.decode('x', [0, 10 ** 20])
+            raise AssertionError('It should fail')
+        except DataValidationError as e:
+            self.assertEqual((e.path, e.err), ('[1]', 'Invalid datetime 100000000000000000000'))
+
+    def test_array_field(self):
+        class Telemetry(DictAble):
+            ticks: List[int] = ArrayField(IntField(), use_numpy=False)
+            samples: List[float] = ArrayField(FloatField(), use_numpy=False)
+            flags: List[bool] = ArrayField(BoolField(), use_numpy=False)
+
+        raw = {'ticks': [1, -(1 << 63)], 'samples': [0.5, 1.5], 'flags': [True, False]}
+        t = Telemetry(dict=raw)
+        self.assertEqual(t.ticks, array('q', [1, -(1 << 63)]))
+        self.assertEqual(t.samples, array('d', [0.5, 1.5]))
+        self.assertEqual(t.to_dict(), raw)
+        self.assertEqual(Telemetry.from_trusted(raw).to_dict(), raw)
+        self.assertEqual(
+            Telemetry(ticks=[1], samples=[], flags=[False]).to_dict(), {'ticks': [1], 'samples': [], 'flags': [False]}
+        )
+        for bad, path in [
+            ({**raw, 'samples': [0.5, 1]}, 'samples.[1]'),
+            ({**raw, 'flags': [True, 0]}, 'flags.[1]'),
+            ({**raw, 'ticks': [1, 1 << 63]}, 'ticks.[1]'),
+        ]:
+            for build in (Telemetry.validate_dict, lambda d: Telemetry(dict=d)):
+                try:
+                    build(bad)
+                    raise AssertionError('It should fail')
+                except DataValidationError as e:
+                    self.assertEqual(e.path, path)
+        errors = Telemetry.collect_errors({**raw, 'samples': [1, 'a', 2.0]})
+        self.assertEqual([p for p, _ in errors], ['samples.[0]', 'samples.[1]'])
+        self.assertRaises(DataValidationError, lambda: Telemetry(ticks=array('d'), samples=[], flags=[]))
+        self.assertRaises(TypeError, lambda: ArrayField(StrField()))
+        self.assertEqual(ArrayField(IntField()).spec(), {'type': 'ArrayField', 'required': False, 'of': IntField().spec()})
@@ -2,7 +2,8 @@ from enum import Enum
 from typing import TypeVar, Generic, List
 from unittest import TestCase
 
-from pydictable import GenericDictAble, ListField, EnumField, DictAble, ObjectField, DataValidationError
+from pydictable import GenericDictAble, ListField, EnumField, DictAble, ObjectField, DataValidationError, IntField, \
+    StrField
 
 
 class TestGeneric(TestCase):
@@ -37,3 +38,17 @@ class TestGeneric(TestCase):
         self.assertEqual(l.city.options[0], City.Bangalore)
 
         self.assertRaises(DataValidationError, lambda: Profile(dict={'gender': {'options': ['invalid']}}))
+
+    def test_compact(self):
+        class Counted(GenericDictAble, compact=True):
+            name: str = StrField(required=True)
+            count: int = None
+
+            @staticmethod
+            def inject(limit: int):
+                return {'count': IntField(default=limit)}
+
+        three = Counted.make(3)
+        self.assertEqual(sorted(three.get_fields()), ['count', 'name'])
+        self.assertEqual(three(dict={'name': 'a'}).to_dict(), {'name': 'a', 'count': 3})
+        self.assertRaises(DataValidationError, lambda: three(dict={}))
@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+from pydictable.core import DictAble
+from pydictable.field import DataValidationError
+from pydictable.instrument import instrument, enable, disable, PHASES
+
+
+class LatLng(DictAble):
+    lat: int
+    lng: int
+
+
+class Address(DictAble):
+    pin_code: int
+    lat_lng: LatLng
+
+    def validate(self):
+        assert self.pin_code > 0, 'pin_code should be positive'
+
+
+class CompiledAddress(Address, compiled=True):
+    pass
+
+
+class TestInstrument(TestCase):
+    def test_instrument(self):
+        init = DictAble.__dict__['__init__']
+        with instrument() as stats:
+            address = Address(dict={'pin_code': 1, 'lat_lng': {'lat': 1, 'lng': 2}})
+            address.to_dict()
+            self.assertRaises(DataValidationError, Address.validate_dict, {'pin_code': 1, 'lat_lng': {'lat': 'a'}})
+            self.assertRaises(DataValidationError, Address, dict={'pin_code': -1, 'lat_lng': {'lat': 1, 'lng': 2}})
+            self.assertRaises(DataValidationError, Address, dict={'pin_code': 1, 'lat_lng': {'lat': 1}})
+
+        self.assertIs(DictAble.__dict__['__init__'], init)
+        Address(dict={'pin_code': 1, 'lat_lng': {'lat': 1, 'lng': 2}})
+        exported = stats.to_dict()
+        address_stats = exported[f'{__name__}.Address']
+        lat_lng_stats = exported[f'{__name__}.LatLng']
+        self.assertEqual(address_stats['construct'], 3)
+        self.assertEqual(lat_lng_stats['construct'], 3)
+        self.assertEqual(address_stats['failures'], {'lat_lng': 2, '.': 1})
+        self.assertEqual(lat_lng_stats['failures'], {'lat': 1, 'lng': 1})
+        self.assertEqual(set(address_stats['time']), set(PHASES))
+        self.assertTrue(all(address_stats['time'][phase] > 0 for phase in PHASES))
+
+    def test_compiled(self):
+        raw = {'pin_code': 1, 'lat_lng': {'lat': 1, 'lng': 2}}
+        CompiledAddress(dict=raw)
+        with instrument() as stats:
+            for obj in (CompiledAddress(dict=raw), CompiledAddress.from_dicts([raw])[0]):
+                self.assertEqual(obj.to_dict(), raw)
+        address_time = stats.to_dict()[f'{__name__}.CompiledAddress']['time']
+        self.assertTrue(all(address_time[phase] > 0 for phase in ('construct', 'from_dict', 'validate', 'hook')))
+        self.assertIsNotNone(CompiledAddress._DictAble__get_codecs())
+
+    def test_enable_twice(self):
+        enable()
+        try:
+            self.assertRaises(RuntimeError, enable)
+        finally:
+            stats = disable()
+        self.assertEqual(stats.to_dict(), {})
@@ -0,0 +1,154 @@
+import json
+import math
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List
+from unittest import TestCase
+
+from pydictable import test_core
+from pydictable.core import DictAble, JsonValidationError
+from pydictable.field import IntField, ObjectField, StrField
+from pydictable.json_codec import JSON_BACKENDS, JsonBackend, get_json_backend, register_json_backend, \
+    set_default_json_backend
+from pydictable.type import _DictAbleMeta
+
+
+class Color(Enum):
+    RED = 'red'
+
+
+class Label(str, Enum):
+    A = 'a'
+
+
+class _JsonDictAbleMeta(_DictAbleMeta):
+    # Routes cls(dict=d) through from_json, the objects made while from_json runs are built as usual
+    decoding = False
+
+    def __call__(cls, *args, **kwargs):
+        d = kwargs.get('dict')
+        if not args and len(kwargs) == 1 and d and not _JsonDictAbleMeta.decoding:
+            try:
+                text = json.dumps(d)
+            except (TypeError, ValueError):
+                text = None
+            if text is not None and json.loads(text) == d:
+                _JsonDictAbleMeta.decoding = True
+                try:
+                    return cls.from_json(text)
+                finally:
+                    _JsonDictAbleMeta.decoding = False
+        return super(_JsonDictAbleMeta, cls).__call__(*args, **kwargs)
+
+
+class _JsonDictAble(DictAble, metaclass=_JsonDictAbleMeta):
+    pass
+
+
+class TestJsonCore(test_core.TestCore):
+    """
+    Runs the whole core suite decoding every dict given to the constructor through from_json(json.dumps(d))
+    """
+
+    def setUp(self):
+        test_core.DictAble = _JsonDictAble
+
+    def tearDown(self):
+        test_core.DictAble = DictAble
+
+
+class TestJson(TestCase):
+    def test_from_json(self):
+        class LatLng(DictAble):
+            lat: int
+            lng: int = IntField(key='long')
+
+        class Trip(DictAble):
+            name: str
+            path: List[LatLng]
+            home: LatLng = ObjectField(LatLng)
+
+        doc = '{"name": "Zoë", "path": [{"lat": 1, "long": 2}, {"lat": 3, "long": 4}], "home": null}'
+        self.assertEqual(Trip.from_json(doc).to_dict(), Trip(dict=json.loads(doc)).to_dict())
+        self.assertEqual(Trip.from_json(doc.encode()).path[1].lng, 4)
+
+        bad = doc.replace('4}', '"x"}').encode()
+        try:
+            Trip.from_json(bad)
+            raise AssertionError('It should fail')
+        except JsonValidationError as e:
+            self.assertEqual(e.path, 'path.[1].lng')
+            self.assertEqual(bad[e.offset:e.offset + 3], b'"x"')
+
+        # rejected at the first key, the rest is never parsed
+        try:
+            Trip.from_json('{"name": 1, not json')
+            raise AssertionError('It should fail')
+        except JsonValidationError as e:
+            self.assertEqual((e.path, e.offset), ('name', 9))
+
+        try:
+            Trip.from_json(' [1]')
+            raise AssertionError('It should fail')
+        except JsonValidationError as e:
+            self.assertEqual((e.path, e.err, e.offset), ('.', 'Expected a dict, got list', 1))
+        self.assertRaises(json.JSONDecodeError, lambda: Trip.from_json('{"name": "a", "path": []} x'))
+        self.assertRaises(json.JSONDecodeError, lambda: Trip.from_json('{"name": "a", "path": [}'))
+        self.assertEqual(Trip.from_json('{"name": "b", "name": "a", "path": []}').name, 'a')
+
+    def test_backends(self):
+        class Reading(DictAble):
+            label: str
+            values: List[float]
+            counts: Dict[str, int]
+            note: str = StrField()
+
+        docs = [
+            {'label': 'Zoë "x"\n\u2028/', 'values': [0.1, 1e16, 1e-7, -0.0], 'counts': {'a': 1 << 70}},
+            {'label': '', 'values': [math.nan, math.inf], 'counts': {}, 'note': 'ok'},
+            {'label': 'a', 'values': [1.5], 'counts': {'b': -3}},
+            {'label': 'b', 'values': [1e-5, -2.5e-7, 1e-4, 1.5e17, 123456789012345.0], 'counts': {}},
+        ]
+        for name in JSON_BACKENDS:
+            for doc in docs:
+                reading = Reading(dict=doc)
+                for skip_optional in (False, True):
+                    expected = json.dumps(reading.to_dict(skip_optional), separators=(',', ':'), ensure_ascii=False)
+                    self.assertEqual(reading.to_json(skip_optional, backend=name), expected)
+                    self.assertEqual(reading.to_json_bytes(skip_optional, backend=name), expected.encode())
+                text = reading.to_json()
+                self.assertEqual(Reading.from_json(text, backend=name).to_json(), text)
+                self.assertEqual(Reading.from_json(text.encode(), backend=name).to_json(), text)
+            bad = b'{"label": "a", "values": [1.5, "x"], "counts": {}}'
+            try:
+                Reading.from_json(bad, backend=name)
+                raise AssertionError('It should fail')
+            except JsonValidationError as e:
+                self.assertEqual((e.path, bad[e.offset:e.offset + 3]), ('values.[1]', b'"x"'))
+            self.assertRaises(json.JSONDecodeError, lambda: Reading.from_json('{"label": "a",', backend=name))
+            try:
+                Reading.from_json('{"label": 1, not json', backend=name)  # checked before the syntax error
+                raise AssertionError('It should fail')
+            except JsonValidationError as e:
+                self.assertEqual((e.path, e.offset), ('label', 10))
+
+            # written like the stdlib, or rejected like it
+            backend_dumps = JSON_BACKENDS[name].dumps
+            for value in ([1e-5, [0.00012, -1e20]], {'\ud800': ['\udfff']}, ['é', {'a': None, 'b': True}]):
+                self.assertEqual(backend_dumps(value), json.dumps(value, separators=(',', ':'), ensure_ascii=False))
+            for value in ([datetime(2024, 1, 1)], {'a': [Color.RED]}, [uuid.UUID(int=1)]):
+                self.assertRaises(TypeError, backend_dumps, value)
+            self.assertEqual(backend_dumps([Label.A]), '["a"]')
+
+        self.assertRaises(ValueError, lambda: Reading(dict=docs[2]).to_json(backend='missing'))
+        default = get_json_backend()
+        register_json_backend(JsonBackend('upper', lambda value: json.dumps(value).upper(), json.loads))
+        try:
+            set_default_json_backend('upper')  # only lists and dicts are encoded by the backend
+            self.assertEqual(
+                Reading(dict=docs[2]).to_json(skip_optional=True), '{"label":"a","values":[1.5],"counts":{"B": -3}}'
+            )
+        finally:
+            set_default_json_backend(default.name)
+            del JSON_BACKENDS['upper']
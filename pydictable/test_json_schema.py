@@ -1,6 +1,6 @@
 from unittest import TestCase
-from pydictable import DictAble, StrField, ListField, ObjectField, UnionField
-from pydictable.json_schema import get_json_schema
+from pydictable import DictAble, StrField, ListField, ObjectField, UnionField, MultiTypeField, IntField
+from pydictable.json_schema import get_json_schema, get_json_schemas
 
 
 class TestJSONSchema(TestCase):
@@ -78,3 +78,82 @@ class TestJSONSchema(TestCase):
                 '$root': '#/$defs/A'
             }
         )
+
+    def test_multi_type_field(self):
+        class Car(DictAble):
+            seats = StrField()
+
+        class Bike(DictAble):
+            pass
+
+        class Garage(DictAble):
+            vehicle = MultiTypeField([Car, Bike], type_key='kind', aliases={'auto': Car})
+
+        schema = get_json_schema(Garage, new_schema=True)
+        self.assertEqual(schema['$defs']['Garage']['vehicle'], {
+            'type': 'MultiTypeField',
+            'required': False,
+            'tag': 'kind',
+            'of': {
+                'Car': {'$ref': '#/$defs/Car'},
+                'Bike': {'$ref': '#/$defs/Bike'},
+                'auto': {'$ref': '#/$defs/Car'}
+            }
+        })
+        self.assertEqual(set(schema['$defs']), {'Garage', 'Car', 'Bike'})
+        spec = get_json_schema(Garage)['vehicle']
+        self.assertEqual(spec['tag'], 'kind')
+        self.assertEqual(spec['of']['auto'], {'seats': {'type': 'StrField', 'required': False}})
+
+    def test_cache(self):
+        class Address(DictAble):
+            city = StrField()
+
+        class Person(DictAble):
+            name = StrField()
+            address = ObjectField(Address)
+
+        spec = Person.get_input_spec()
+        cache = Person.__dict__['_DictAble__input_spec']
+        spec['address']['of']['city']['required'] = True  # copies, the cached ones stay as they are
+        self.assertEqual(Person.get_input_spec()['address']['of']['city'], {'type': 'StrField', 'required': False})
+        self.assertIs(Person.__dict__['_DictAble__input_spec'], cache)
+        schema = get_json_schema(Person, new_schema=True)
+        schema['$defs']['Address'].clear()
+        self.assertIn('city', get_json_schema(Person, new_schema=True)['$defs']['Address'])
+        self.assertIn('city', get_json_schemas([Person])['$defs']['Address'])
+
+        Address.pin = IntField()
+        self.assertEqual(Person.get_input_spec()['address']['of']['pin'], {'type': 'IntField', 'required': False})
+        self.assertIsNot(Person.__dict__['_DictAble__input_spec'], cache)
+        self.assertIn('pin', get_json_schema(Person, new_schema=True)['$defs']['Address'])
+
+    def test_recursion_detected(self):
+        class Node(DictAble):
+            value = IntField()
+
+        self.assertFalse(Node.is_recursive())
+        Node.children = ListField(ObjectField(Node))
+        self.assertTrue(Node.is_recursive())
+        self.assertRaisesRegex(RecursionError, 'Node refers to itself', Node.get_input_spec)
+        self.assertEqual(get_json_schema(Node)['$root'], '#/$defs/Node')
+
+        class Tree(DictAble):
+            root = ObjectField(Node)
+
+        self.assertTrue(Tree.is_recursive())
+
+    def test_many(self):
+        class Address(DictAble):
+            city = StrField()
+
+        class Person(DictAble):
+            address = ObjectField(Address)
+
+        class Company(DictAble):
+            address = ObjectField(Address)
+
+        schema = get_json_schemas([Person, Company])
+        self.assertEqual(schema['$roots'], {'Person': '#/$defs/Person', 'Company': '#/$defs/Company'})
+        self.assertEqual(list(schema['$defs']), ['Person', 'Address', 'Company'])
+        self.assertEqual(schema['$defs']['Company']['address']['of'], {'$ref': '#/$defs/Address'})
@@ -0,0 +1,150 @@
+import copy
+import json
+from typing import List, Optional
+from unittest import TestCase
+
+from pydictable import test_core
+from pydictable.core import DictAble
+from pydictable.field import DataValidationError, IntField, ObjectField, StrField
+
+
+class _LazyDictAble(DictAble, lazy=True):
+    pass
+
+
+class TestLazyCore(test_core.TestCore):
+    """
+    Runs the whole core suite against classes building nested values on first read
+    """
+
+    def setUp(self):
+        test_core.DictAble = _LazyDictAble
+
+    def tearDown(self):
+        test_core.DictAble = DictAble
+
+
+class TestLazy(TestCase):
+    def test_materialized_on_read(self):
+        class LatLng(DictAble):
+            lat: int
+            lng: int
+
+        class Address(DictAble, lazy=True):
+            pin_code: int
+            lat_lng: LatLng
+            history: Optional[List[LatLng]]
+            home = ObjectField(LatLng)
+
+        d = {'pin_code': 560001, 'lat_lng': {'lat': 1, 'lng': 2}, 'history': [{'lat': 3, 'lng': 4}]}
+        address = Address(dict=d)
+        self.assertEqual(address._lazy_raw, {'lat_lng': d['lat_lng'], 'history': d['history']})
+        self.assertIs(address.to_dict()['lat_lng'], d['lat_lng'])
+        self.assertIsNone(address.home)
+
+        lat_lng = address.lat_lng
+        self.assertIsInstance(lat_lng, LatLng)
+        self.assertEqual(lat_lng.lng, 2)
+        self.assertIs(address.lat_lng, lat_lng)
+        self.assertIn('lat_lng', address.__dict__)
+        lat_lng.lat = 10
+        self.assertEqual(address.to_dict(), {
+            'pin_code': 560001, 'lat_lng': {'lat': 10, 'lng': 2}, 'history': [{'lat': 3, 'lng': 4}], 'home': None
+        })
+        self.assertEqual(address.history[0].lat, 3)
+
+        address.home = LatLng(lat=5, lng=6)
+        self.assertEqual(address.to_dict()['home'], {'lat': 5, 'lng': 6})
+        self.assertIsInstance(Address.home, ObjectField)
+        self.assertEqual(list(Address.get_fields()), ['home', 'pin_code', 'lat_lng', 'history'])
+
+    def test_validated_up_front(self):
+        class LatLng(DictAble):
+            lat: int
+            lng: int
+
+        class Address(DictAble, lazy=True):
+            lat_lng: LatLng
+
+        self.assertRaisesRegex(DataValidationError, "Invalid value a for field lat", Address,
+                               dict={'lat_lng': {'lat': 'a', 'lng': 2}})
+        self.assertEqual(Address.from_trusted({'lat_lng': {'lat': 1, 'lng': 2}}).lat_lng.lat, 1)
+        self.assertEqual(Address.from_dicts([{'lat_lng': {'lat': 1, 'lng': 2}}])[0].lat_lng.lng, 2)
+
+    def test_hooks_run_up_front(self):
+        class LatLng(DictAble):
+            lat: int
+            lng: int
+
+            def validate(self):
+                assert self.lat >= 0, 'lat should not be negative'
+
+        class Address(DictAble, lazy=True):
+            lat_lng: LatLng
+            history: List[LatLng]
+
+        self.assertRaisesRegex(DataValidationError, 'lat should not be negative', Address,
+                               dict={'lat_lng': {'lat': -1, 'lng': 2}, 'history': []})
+        self.assertRaisesRegex(DataValidationError, 'lat should not be negative', Address,
+                               dict={'lat_lng': {'lat': 1, 'lng': 2}, 'history': [{'lat': -1, 'lng': 2}]})
+        address = Address(dict={'lat_lng': {'lat': 1, 'lng': 2}, 'history': []})
+        self.assertEqual(address._lazy_raw, {})  # built up front, the hook had to run
+        self.assertIsInstance(address.lat_lng, LatLng)
+
+    def test_to_dict_before_read(self):
+        class LatLng(DictAble):
+            lat: int = IntField(required=True)
+            lng: int = IntField(default=0)
+
+        class Address(DictAble, lazy=True):
+            city: str = StrField()
+            lat_lng: LatLng
+            history: List[LatLng]
+
+        d = {'lat_lng': {'lat': 1, 'lng': 2}, 'history': [{'lat': 3}], 'extra': 1}
+        address = Address(dict=d)
+        self.assertIs(address.to_dict()['lat_lng'], d['lat_lng'])  # same as built, given back as received
+        self.assertEqual(address.to_dict(), {'city': None, 'lat_lng': {'lat': 1, 'lng': 2}, 'history': [{'lat': 3, 'lng': 0}]})
+        self.assertEqual(Address(dict={'lat_lng': {'lat': 1, 'lng': 2, 'x': 3}, 'history': []}).to_json(),
+                         '{"city":null,"lat_lng":{"lat":1,"lng":2},"history":[]}')
+
+        class Place(DictAble):
+            name: str = StrField()
+            address: Address = ObjectField(Address)
+
+        class Places(DictAble, lazy=True):
+            places: List[Place]
+
+        raw = {'places': [{'address': {'lat_lng': {'lat': 1, 'lng': 2}, 'history': []}}]}
+        places = Places(dict=raw)
+        self.assertEqual(places.to_dict(skip_optional=True), raw)
+        self.assertEqual(places.to_json(skip_optional=True), json.dumps(raw, separators=(',', ':')))
+        self.assertEqual(places.to_dict(), {
+            'places': [{'name': None, 'address': {'city': None, 'lat_lng': {'lat': 1, 'lng': 2}, 'history': []}}]
+        })
+
+        address = Address(dict=d)
+        address.lat_lng = LatLng(lat=5)
+        self.assertEqual(address.to_dict()['lat_lng'], {'lat': 5, 'lng': 0})
+        self.assertEqual(address.lat_lng.lat, 5)
+
+        address = Address(dict=d)
+        shallow = copy.copy(address)
+        self.assertEqual(shallow.lat_lng.lat, 1)
+        self.assertEqual(address.lat_lng.lat, 1)  # the raw values shared with the copy are left as they are
+        self.assertIsNot(address.lat_lng, shallow.lat_lng)
+        deep = copy.deepcopy(Address(dict=d))
+        self.assertEqual(deep.history[0].lng, 0)
+
+    def test_options(self):
+        class Person(DictAble, lazy=True, compiled=True):
+            name: str = StrField()
+            age: int = IntField(default=18)
+
+        self.assertEqual(Person(dict={'name': 'Pramod'}).to_dict(), {'name': 'Pramod', 'age': 18})
+
+        def lazy_compact():
+            class LatLng(DictAble, lazy=True, compact=True):
+                lat: int
+
+        self.assertRaises(TypeError, lazy_compact)
@@ -0,0 +1,71 @@
+import pickle
+from enum import Enum
+from typing import TypeVar, Generic, List
+from unittest import TestCase
+
+from pydictable import DictAble, DataValidationError, GenericDictAble, ListField, EnumField, partial
+
+T = TypeVar('T')
+
+
+class LatLng(DictAble):
+    lat: int
+    lng: int
+
+
+class Address(DictAble):
+    pin_code: int
+    lat_lng: LatLng
+
+
+class Product(DictAble):
+    name: str
+    price: int
+
+
+class Color(Enum):
+    red = 'red'
+    blue = 'blue'
+
+
+class SelectField(GenericDictAble, Generic[T]):
+    options: List[T] = None
+
+    @staticmethod
+    def inject(item: T):
+        return {'options': ListField(EnumField(item))}
+
+
+class TestParallel(TestCase):
+    def test_pickle_dynamic_classes(self):
+        partial_product = partial(Product)
+        self.assertIs(pickle.loads(pickle.dumps(partial_product)), partial_product)
+        product = pickle.loads(pickle.dumps(partial_product(dict={'name': 'pen'})))
+        self.assertIsInstance(product, partial_product)
+        self.assertEqual(product.to_dict(), {'name': 'pen', 'price': None})
+
+        color_select = SelectField.make(Color)
+        self.assertIs(pickle.loads(pickle.dumps(color_select)), color_select)
+        select = pickle.loads(pickle.dumps(color_select(dict={'options': ['red']})))
+        self.assertEqual(select.options, [Color.red])
+
+        self.assertIs(pickle.loads(pickle.dumps(Address)), Address)
+
+    def test_validate_many(self):
+        rows = [{'pin_code': i, 'lat_lng': {'lat': i, 'lng': i}} for i in range(25)]
+        rows[7]['lat_lng']['lng'] = 'x'
+        rows[20] = None
+        for workers in (1, 2):
+            results = Address.validate_many(rows, workers=workers, chunksize=4)
+            self.assertEqual(len(results), 25)
+            self.assertEqual(results[6].lat_lng.lat, 6)
+            self.assertEqual(results[24].pin_code, 24)
+            self.assertIsInstance(results[7], DataValidationError)
+            self.assertEqual(results[7].path, '[7].lat_lng.lng')
+            self.assertEqual(results[20].path, '[20]')
+
+        partial_product = partial(Product)
+        results = partial_product.validate_many([{'name': 'pen'}, {'price': 'free'}, {}], workers=2, chunksize=1)
+        self.assertIsInstance(results[0], partial_product)
+        self.assertEqual(results[1].path, '[1].price')
+        self.assertEqual(results[2].to_dict(), {'name': None, 'price': None})
@@ -0,0 +1,128 @@
+import math
+import os
+import pickle
+import tempfile
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List, Optional
+from unittest import TestCase
+
+from pydictable import DictAble, DataValidationError
+from pydictable.field import EnumField, IntField, StrField
+from pydictable.snapshot import SnapshotSchemaError, load_snapshot, write_snapshot
+
+
+class LatLng(DictAble):
+    lat: int
+    lng: int
+
+
+class Color(Enum):
+    RED = 'red'
+
+
+class Place(DictAble):
+    name: str
+    rank: int
+    score: float
+    open: bool
+    home: LatLng
+    tags: List[str]
+    counts: Dict[str, int]
+    seen: datetime
+    color: Color = EnumField(Color, key='c')
+    note: Optional[str]
+
+
+class CompactLatLng(DictAble, compact=True):
+    lat: int
+    lng: int = IntField(key='long')
+
+
+class LazyPlace(DictAble, lazy=True):
+    name: str
+    home: LatLng
+
+
+class TestSnapshot(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'places.snapshot')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_snapshot(self):
+        places = [
+            Place(dict={'name': 'Zoë \ud800', 'rank': 1 << 70, 'score': math.inf, 'open': True,
+                        'home': {'lat': 1, 'lng': 2}, 'tags': ['a', 'b'], 'counts': {'x': 1},
+                        'seen': 1704153600000, 'c': 'red'}),
+            Place(dict={'name': '', 'rank': -3, 'score': 0.5, 'open': False, 'home': {'lat': 3, 'lng': 4},
+                        'tags': [], 'counts': {}, 'seen': 1704153600000, 'note': 'n'}),
+        ]
+        self.assertEqual(write_snapshot(Place, places, self.path), 2)
+        with load_snapshot(Place, self.path) as snapshot:
+            self.assertEqual(len(snapshot), 2)
+            self.assertEqual([p.to_dict() for p in snapshot], [p.to_dict() for p in places])
+            place = snapshot[-1]
+            self.assertIsInstance(place, Place)
+            self.assertNotIn('home', place.__dict__)  # decoded on first read only
+            self.assertEqual((place.home.lat, place.seen, place.color), (3, places[1].seen, None))
+            self.assertIs(place.home, place.home)
+            place.rank = 7
+            self.assertEqual(place.rank, 7)
+            self.assertEqual(snapshot[0].rank, 1 << 70)
+            self.assertEqual(snapshot.get_raw(0)['c'], 'red')
+            self.assertEqual([p.name for p in snapshot[::-1]], ['', 'Zoë \ud800'])
+            self.assertRaises(IndexError, lambda: snapshot[2])
+
+            copy = pickle.loads(pickle.dumps(snapshot[0]))
+            self.assertIs(type(copy), Place)
+            self.assertEqual(copy.to_dict(), places[0].to_dict())
+            self.assertEqual(Place.get_fields(), type(place).get_fields())
+        self.assertRaises(ValueError, lambda: place.tags)  # never read before close()
+
+        self.assertRaises(TypeError, lambda: write_snapshot(Place, [LatLng(lat=1, lng=2)], self.path))
+        with open(self.path, 'wb') as f:
+            f.write(b'{"not": "a snapshot"}')
+        self.assertRaises(ValueError, lambda: load_snapshot(Place, self.path))
+
+    def test_compact_and_lazy(self):
+        write_snapshot(CompactLatLng, [CompactLatLng(dict={'lat': 1, 'long': 2})], self.path)
+        with load_snapshot(CompactLatLng, self.path) as snapshot:
+            self.assertEqual((snapshot[0].lat, snapshot[0].to_dict()), (1, {'lat': 1, 'long': 2}))
+
+        write_snapshot(LazyPlace, [LazyPlace(dict={'name': 'a', 'home': {'lat': 1, 'lng': 2}})], self.path)
+        with load_snapshot(LazyPlace, self.path) as snapshot:
+            self.assertEqual(snapshot[0].home.lng, 2)
+            self.assertEqual(snapshot[0].to_dict(), {'name': 'a', 'home': {'lat': 1, 'lng': 2}})
+
+    def test_schema_change(self):
+        class Item(DictAble):
+            name: str
+            count: int
+
+        write_snapshot(Item, [Item(name='a', count=1), Item(name='b', count=2)], self.path)
+        Item.label = StrField(default='none')
+        try:
+            try:
+                load_snapshot(Item, self.path)
+                raise AssertionError('It should fail')
+            except SnapshotSchemaError as e:
+                self.assertNotIn('label', e.stored['$defs']['Item'])
+                self.assertIn('label', e.current['$defs']['Item'])
+            with load_snapshot(Item, self.path, migrate=True) as snapshot:
+                self.assertTrue(snapshot.migrated)
+                self.assertEqual([i.to_dict() for i in snapshot], [
+                    {'name': 'a', 'count': 1, 'label': 'none'},
+                    {'name': 'b', 'count': 2, 'label': 'none'}
+                ])
+            Item.count = StrField()
+            with load_snapshot(Item, self.path, migrate=True) as snapshot:
+                self.assertRaises(DataValidationError, lambda: snapshot[0])  # checked like cls(dict=...)
+        finally:
+            del Item.label
+            Item.count = IntField(required=True)
+        with load_snapshot(Item, self.path) as snapshot:
+            self.assertFalse(snapshot.migrated)
+            self.assertEqual(snapshot[1].count, 2)
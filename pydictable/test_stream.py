@@ -0,0 +1,60 @@
+import io
+import json
+import mmap
+import tempfile
+from unittest import TestCase
+
+from pydictable import DictAble, DataValidationError
+from pydictable.stream import iter_json_array, iter_jsonl
+
+
+class LatLng(DictAble):
+    lat: int
+    lng: int
+
+
+class TestStream(TestCase):
+    def test_iter_json_array(self):
+        data = [{'name': 'é' * i, 'values': [i, 1.5, None, True]} for i in range(50)] + [1, 'two', [], {}]
+        text = json.dumps(data)
+        for chunk_size in (1, 7, 1 << 16):
+            self.assertEqual(list(iter_json_array(io.StringIO(text), chunk_size)), data)
+            self.assertEqual(list(iter_json_array(io.BytesIO(text.encode()), chunk_size)), data)
+        self.assertEqual(list(iter_json_array(io.StringIO(' [ ] '))), [])
+        self.assertRaises(json.JSONDecodeError, lambda: list(iter_json_array(io.StringIO('[1, 2'))))
+        self.assertRaises(json.JSONDecodeError, lambda: list(iter_json_array(io.StringIO('[1 2]'))))
+        self.assertRaises(json.JSONDecodeError, lambda: list(iter_json_array(io.StringIO('{}'))))
+        self.assertEqual(list(iter_json_array(io.StringIO('[1, 2] \n'), 1)), [1, 2])
+        for text in ('[1,2]xx', '[]x', '[1] [2]'):
+            for chunk_size in (1, 1 << 16):
+                self.assertRaises(json.JSONDecodeError, lambda: list(iter_json_array(io.StringIO(text), chunk_size)))
+
+    def test_iter_jsonl(self):
+        self.assertEqual(list(iter_jsonl(io.BytesIO(b'{"a": 1}\n\n{"a": 2}\n'))), [{'a': 1}, {'a': 2}])
+        self.assertEqual(list(iter_jsonl(io.StringIO('[1]'))), [[1]])
+
+    def test_model_iterators(self):
+        rows = [{'lat': i, 'lng': i} for i in range(10)]
+        points = LatLng.iter_from_json_array(io.StringIO(json.dumps(rows)), chunk_size=5)
+        self.assertEqual([p.to_dict() for p in points], rows)
+
+        with tempfile.TemporaryFile() as f:
+            f.write('\n'.join(json.dumps(row) for row in rows).encode())
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                self.assertEqual([p.lat for p in LatLng.iter_from_jsonl(m)], list(range(10)))
+
+        text = '{"lat": 1, "lng": 1}\n{"lat": "x", "lng": 1}\n3\n{"lat": 2, "lng": 2}'
+        points = LatLng.iter_from_jsonl(io.StringIO(text))
+        self.assertEqual(next(points).lat, 1)
+        try:
+            next(points)
+            raise AssertionError('It should fail')
+        except DataValidationError as e:
+            self.assertEqual(e.path, '[1].lat')
+
+        results = list(LatLng.iter_from_jsonl(io.StringIO(text), yield_errors=True))
+        self.assertEqual(
+            [r.path if isinstance(r, DataValidationError) else r.lat for r in results],
+            [1, '[1].lat', '[2]', 2]
+        )
@@ -1,6 +1,10 @@
-from abc import abstractmethod
+import copyreg
+import weakref
+from abc import ABCMeta, abstractmethod
 from typing import Any, Callable, Tuple
 
+from pydictable.json_codec import fragment, dumps
+
 DefaultFactoryType = Tuple[Callable, Tuple[Any], dict]
 
 
@@ -33,6 +37,35 @@ class Field:
     def validate(self, field_name: str, v):
         pass
 
+    def collect_errors(self, field_name: str, v, errors):
+        """
+        Like validate_dict, but containers record the failures of their elements in `errors` (a ValidationErrors)
+        and go on. A failure of the value itself is raised like validate_dict does.
+        """
+        self.validate_dict(field_name, v)
+
+    def write_json(self, v, skip_optional: bool, out: list, dumps: Callable[[Any], str] = dumps):
+        """
+        Appends the JSON text of the value to out, the same text as dumping to_dict(v) gives.
+        `dumps` is the JsonBackend.dumps encoding containers.
+        """
+        out.append(fragment(self.to_dict(v, skip_optional), dumps))
+
+    def decode(self, field_name: str, v):
+        """
+        Validates and converts a raw value in a single step, raising like validate_dict does.
+        Values returned from here are not checked again with validate, unless the field class overrides the
+        validate of a built-in field.
+        """
+        self.validate_dict(field_name, v)
+        return self.from_dict(v)
+
+    def from_trusted(self, v):
+        """
+        Converts a raw value already known to be valid, without validating it
+        """
+        return self.from_dict(v)
+
     def of(self):
         return
 
@@ -47,7 +80,162 @@ class Field:
         return spec
 
 
-class _BaseDictAble:
+def _slot_names(classes) -> set:
+    names = set()
+    for klass in classes:
+        for base in klass.__mro__:
+            slots = base.__dict__.get('__slots__', ())
+            names.update([slots] if isinstance(slots, str) else slots)
+    return names
+
+
+def _compact_namespace(bases: tuple, namespace: dict) -> dict:
+    """
+    Moves the Field objects out of the class namespace into `_slot_fields` and declares a slot per field
+    """
+    namespace = dict(namespace)
+    slot_fields = {}
+    for name, value in list(namespace.items()):
+        if isinstance(value, Field):
+            slot_fields[name] = namespace.pop(name)
+    names = list(slot_fields)
+    for name in namespace.get('__annotations__', {}):
+        if name not in slot_fields:
+            namespace.pop(name, None)  # a plain value like `x: int = None` would clash with the slot
+            names.append(name)
+    slotted = _slot_names(bases)
+    namespace['__slots__'] = tuple(name for name in names if name not in slotted)
+    namespace['_slot_fields'] = slot_fields
+    namespace['_compact'] = True
+    return namespace
+
+
+class _LazyAttribute:
+    """
+    Stands in for a nested field on a lazy DictAble class. The instance keeps the validated raw value aside and
+    it is converted with Field.from_trusted on first read, then stored in the instance __dict__ which takes
+    precedence over this non data descriptor on every later read, like an assigned value does. The raw value is
+    left in place, copies of the instance share it. Read on the class it gives the Field back.
+    """
+    __slots__ = ('name', 'field', 'declared')
+
+    def __init__(self, name: str, field: Field, declared: bool):
+        self.name = name
+        self.field = field
+        self.declared = declared  # False when installed for a type hint or an inherited field
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self.field
+        try:
+            raw = obj.__dict__['_lazy_raw'][self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+        value = obj.__dict__[self.name] = self.field.from_trusted(raw)
+        return value
+
+
+class _DictAbleMeta(ABCMeta):
+    # Source of the per class generations, see get_generation. Derived from ABCMeta so that abc.ABC mixes in
+    generation = 0
+
+    def __new__(mcs, name, bases, namespace, compact: bool = None, **kwargs):
+        if compact is None:
+            compact = any(getattr(base, '_compact', False) for base in bases)
+        if compact and '__slots__' not in namespace:
+            namespace = _compact_namespace(bases, namespace)
+        return super(_DictAbleMeta, mcs).__new__(mcs, name, bases, namespace, **kwargs)
+
+    def __setattr__(cls, name, value):
+        slot_fields = cls.__dict__.get('_slot_fields')
+        if slot_fields is not None and isinstance(value, Field):
+            # The slot descriptor has to stay on the class, the field is kept aside like at class creation
+            if name not in slot_fields and name not in _slot_names([cls]):
+                raise TypeError(f'Can not add field {name} to compact class {cls.__name__} after its creation')
+            slot_fields[name] = value
+            invalidate_fields(cls)
+            return
+        changed = isinstance(value, Field) or isinstance(cls.__dict__.get(name), (Field, _LazyAttribute))
+        super(_DictAbleMeta, cls).__setattr__(name, value)
+        if changed:
+            invalidate_fields(cls)
+
+    def __delattr__(cls, name):
+        slot_fields = cls.__dict__.get('_slot_fields')
+        if slot_fields is not None and name in slot_fields:
+            del slot_fields[name]
+            invalidate_fields(cls)
+            return
+        changed = isinstance(cls.__dict__.get(name), (Field, _LazyAttribute))
+        super(_DictAbleMeta, cls).__delattr__(name)
+        if changed:
+            invalidate_fields(cls)
+
+
+def get_generation(cls: type) -> int:
+    """
+    Changes whenever a Field is set on or removed from the class or one of its bases, so per class caches derived
+    from the fields (see DictAble.get_fields) know when to rebuild
+    """
+    return cls.__dict__.get('_fields_generation', 0)
+
+
+def get_generations(classes) -> tuple:
+    """
+    The generations of many classes, for caches also derived from the fields of the classes a class refers to
+    """
+    return tuple(klass.__dict__.get('_fields_generation', 0) for klass in classes)
+
+
+def invalidate_fields(cls: type):
+    """
+    Gives a new generation to the class and to every class inheriting from it
+    """
+    _DictAbleMeta.generation += 1
+    classes = [cls]
+    while classes:
+        klass = classes.pop()
+        type.__setattr__(klass, '_fields_generation', _DictAbleMeta.generation)
+        classes.extend(klass.__subclasses__())
+
+
+# Classes made at runtime by partial() and GenericDictAble.make() keyed by the call that made them
+_DYNAMIC_CLASSES = weakref.WeakValueDictionary()
+
+
+def register_dynamic_class(cls: type, factory: Callable, *args, **kwargs):
+    """
+    Records how a class created at runtime can be made again, which lets it (and its instances) be pickled,
+    e.g. to send them to a process pool
+    """
+    recipe = (factory, args, tuple(sorted(kwargs.items())))
+    type.__setattr__(cls, '_dynamic_recipe', recipe)
+    try:
+        _DYNAMIC_CLASSES[recipe] = cls
+    except TypeError:
+        pass  # unhashable arguments, the class is made again on every unpickle
+
+
+def _rebuild_dynamic_class(factory: Callable, args: tuple, kwargs: tuple) -> type:
+    try:
+        return _DYNAMIC_CLASSES[(factory, args, kwargs)]
+    except (KeyError, TypeError):
+        return factory(*args, **dict(kwargs))
+
+
+def _reduce_dictable_class(cls: type):
+    recipe = cls.__dict__.get('_dynamic_recipe')
+    if recipe is None:
+        return cls.__qualname__  # pickled by reference like any other class
+    return _rebuild_dynamic_class, recipe
+
+
+copyreg.pickle(_DictAbleMeta, _reduce_dictable_class)
+
+
+class _BaseDictAble(metaclass=_DictAbleMeta):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         pass
 
@@ -59,6 +247,21 @@ class _BaseDictAble:
     def validate_dict(cls, raw_values: dict):
         pass
 
+    def _write_json(self, skip_optional: bool, out: list, dumps: Callable[[Any], str] = dumps):
+        out.append(dumps(self.to_dict(skip_optional)))
+
+    @classmethod
+    def _collect_errors(cls, raw_values: dict, errors):
+        cls.validate_dict(raw_values)
+
+    @classmethod
+    def _decode(cls, raw_values: dict):
+        return cls(dict=raw_values)
+
+    @classmethod
+    def from_trusted(cls, raw_values: dict):
+        return cls(dict=raw_values)
+
     @classmethod
     def get_input_spec(cls):
         pass